@@ -1,9 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+import logging
+from src.app.logging_config import configure_logging, stop_logging
+
+# Configure logging before the routers import the service modules
+configure_logging()
+
 from src.routes.routes import router
 from src.routes.ms_router import ms_router
 from src.routes.trello_routers import trello_router
+from src.app.services.trello_service import trello_auth
+from src.app.services.ms_exchange import mse_token_store
+from src.app.services.text_generation import generate_response
+from src.app.utils import process_ait_files
+from src.app.utils.http_client import close_http_client
 
 app = FastAPI()
 # CORS configuration
@@ -19,6 +30,29 @@ app.include_router(router)
 app.include_router(ms_router)
 app.include_router(trello_router)
 
+@app.on_event("startup")
+async def startup():
+    # Open the MySQL pools once instead of per request
+    await trello_auth.db.create_pool()
+    await mse_token_store.mysql_db.create_pool()
+    await generate_response.db.create_pool()
+    await process_ait_files.db.create_pool()
+    # Token saves upsert on this key; without it they would silently insert duplicate rows
+    if not await trello_auth.db.unique_key_exists("user_services", ["custom_gpt_id", "service_id"]):
+        logging.error(
+            "user_services has no unique key on (custom_gpt_id, service_id); apply "
+            "src/database/migrations/001_user_services_custom_gpt_id_service_id_unique.sql"
+        )
+
+@app.on_event("shutdown")
+async def shutdown():
+    await trello_auth.db.close_pool()
+    await mse_token_store.mysql_db.close_pool()
+    await generate_response.db.close_pool()
+    await process_ait_files.db.close_pool()
+    await close_http_client()
+    stop_logging()
+
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(uvicorn.run(app, host="127.0.0.1", port=8000))
+    # uvicorn runs on uvloop when it is installed and falls back to asyncio otherwise
+    uvicorn.run(app, host="127.0.0.1", port=8000, loop="auto")
@@ -1,7 +1,8 @@
 import logging
+from src.app.logging_config import configure_logging
 
 # Entry point of the application.
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+    configure_logging()
     logging.info("Application started.")
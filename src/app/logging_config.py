@@ -0,0 +1,51 @@
+import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+def configure_logging(log_file: str = None):
+    """
+    Configures root logging once for the whole application.
+
+    Service modules only log through the `logging` module and never
+    configure handlers themselves, so no log file is opened per import.
+    Records are handed to a queue and written to the file and console by a
+    background listener thread, so logging calls never block the event loop on disk I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    log_file = log_file or os.getenv("LOG_FILE", "app.log")
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.FileHandler(log_file),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Only the message is merged into the queued record; LOG_FORMAT is applied by the listener's handlers
+    queue_handler.setFormatter(logging.Formatter())
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # force=True replaces any handler a library attached to the root logger before this ran
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[queue_handler],
+        force=True
+    )
+
+def stop_logging():
+    """
+    Flushes queued records and stops the listener thread; called on application shutdown.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -10,15 +10,6 @@ from google.oauth2.credentials import Credentials
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 SCOPES_URL = os.getenv("SCOPES_URL")
 SCOPES = [SCOPES_URL]
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
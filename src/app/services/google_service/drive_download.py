@@ -16,16 +16,6 @@ SCOPES = os.getenv("SCOPES")
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
 DOWNLOAD_PATH = os.getenv("DOWNLOAD_PATH")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 async def download_files(file_names):
     """
     Downloads specified text files from a Google Drive folder.
@@ -1,15 +1,43 @@
 import os
 import json
+import asyncio
 import logging
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from langchain_core.documents import Document
 from dotenv import load_dotenv
-from src.app.utils.helpers import chunk_text, load_content_drive_file
+from src.app.utils.helpers import chunk_text, list_drive_folder, load_content_drive_file
 
 load_dotenv()
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
 SCOPES = os.getenv("SCOPES")
+MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "8"))
+
+def _list_folder(creds, folder_id):
+    drive_service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+    return list_drive_folder(drive_service, folder_id)
+
+async def _load_drive_file(creds, folder_id, file_name, folder_files, semaphore, logger):
+    """
+    Downloads and chunks a single Drive file in a worker thread.
+
+    googleapiclient service objects are not thread-safe, so every worker
+    builds its own Drive service from the shared credentials.
+    When `folder_files` holds the folder listing, the per-file lookup is skipped.
+    """
+    file_info = None
+    if folder_files is not None:
+        file_info = folder_files.get(file_name)
+        if file_info is None:
+            logger.warning("File not found: %s", file_name)
+            return None, None
+
+    def _download():
+        drive_service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+        return load_content_drive_file(drive_service, folder_id, file_name, logger, file_info=file_info)
+
+    async with semaphore:
+        return await asyncio.to_thread(_download)
 
 async def load_google_documents(file_names, ait_id, document_collection, logger=None):
     """
@@ -40,17 +68,35 @@ async def load_google_documents(file_names, ait_id, document_collection, logger=
 
     try:
         creds = Credentials.from_authorized_user_file(CREDENTIALS_PATH, SCOPES)
-        drive_service = build('drive', 'v3', credentials=creds)
-        logger.info("Google Drive service initialized.")
+        logger.info("Google Drive credentials loaded.")
     except Exception as e:
         logger.error("Failed to initialize Drive API: %s", e)
         return {"status": False, "error": str(e)}
 
+    folder_files = None
+    if len(file_names) > 1:
+        try:
+            # One folder listing resolves every requested name instead of a lookup request per file
+            folder_files = await asyncio.to_thread(_list_folder, creds, folder_id)
+        except Exception as e:
+            logger.error("Failed to list Drive folder: %s", e)
+            return {"status": False, "error": str(e)}
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    content_responses = await asyncio.gather(
+        *(
+            _load_drive_file(creds, folder_id, file_name, folder_files, semaphore, logger)
+            for file_name in file_names
+        ),
+        return_exceptions=True
+    )
+
     documents = []
 
-    for file_name in file_names:
+    for file_name, content_response in zip(file_names, content_responses):
         try:
-            content_response = load_content_drive_file(drive_service, folder_id, file_name, logger)
+            if isinstance(content_response, Exception):
+                raise content_response
             # Handle if load_content_drive_file returns a tuple (e.g., (None, error))
             if isinstance(content_response, tuple):
                 content_response, error = content_response
@@ -15,16 +15,6 @@ load_dotenv()
 SCOPES = os.getenv("SCOPES")
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 async def upload_files(file_names):
     """
     Uploads a list of files to a specific Google Drive folder.
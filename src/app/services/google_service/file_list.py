@@ -14,16 +14,6 @@ load_dotenv()
 SCOPES = os.getenv("SCOPES")
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 async def list_files_in_folder(parent_folder_id: str):
     """
     Lists all files in the specified folder in the user's Google Drive,
@@ -14,16 +14,6 @@ load_dotenv()
 SCOPES = os.getenv("SCOPES")
 CREDENTIALS_PATH = os.getenv("CREDENTIALS_PATH")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 async def list_folders_in_drive():
     """
     Lists folders in the user's Google Drive.
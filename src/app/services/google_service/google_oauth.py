@@ -17,16 +17,6 @@ import google.auth.transport.requests
 
 # from src.app.services.google_service.create_folder import get_or_create_drive_folder
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 load_dotenv()
 
 SCOPES_URL = os.getenv("SCOPES_URL")
@@ -79,7 +69,7 @@ async def authenticate(request: Request):
         drive_url = "https://www.googleapis.com/drive/v3/files"
         headers = {"Authorization": f"Bearer {access_token}"}
         files_response = requests.get(drive_url, headers=headers).json()
-        logging.info(f"Drive files response: {files_response}")
+        logging.debug("Drive files response: %s", files_response)
 
         if "error" in files_response:
             raise HTTPException(status_code=400, detail=f"Failed to fetch Drive files: {files_response}")
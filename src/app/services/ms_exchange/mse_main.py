@@ -3,7 +3,7 @@ import json
 import re
 import time
 import asyncio
-import requests
+import httpx
 import html2text
 from typing import Optional, List, Dict
 import logging
@@ -13,18 +13,10 @@ from datetime import datetime, timedelta, timezone
 from fastapi import Query
 from fastapi.responses import JSONResponse
 from src.app.services.ms_exchange.mse_token_store import get_token, refresh_access_token
+from src.app.utils.http_client import get_http_client
 from src.database.sql_record_manager import sql_record_manager
 from src.app.services.text_processing.create_embeddings import process_and_build_index
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("msexchange_mse_main.log"),
-        logging.StreamHandler()
-    ]
-)
-
 MAX_TOP = 100
 MAX_SEARCH_LENGTH = 255
 MAX_DATE_RANGE_DAYS = 3
@@ -256,18 +248,18 @@ async def make_graph_request(url: str, headers: dict, ait_id: str):
     for attempt in range(max_retries):
         try:
             logging.info(f"Attempt {attempt + 1} of {max_retries}")
-            response = requests.get(url, headers=headers, timeout=30)
+            response = await get_http_client().get(url, headers=headers, timeout=30)
             logging.info(f"Response received with status code: {response.status_code}")
 
             if response.status_code == 200:
-                logging.info(f"Successful response: {response.json()}")
+                logging.debug("Successful response: %s", response.text)
                 return response, None
 
             elif response.status_code == 401:
                 logging.warning("Received 401 Unauthorized. Attempting token refresh...")
                 new_access_token = await refresh_access_token(ait_id)
                 headers = build_headers(new_access_token)
-                logging.info(f"Refreshed token. New headers: {headers}")
+                logging.info("Refreshed token, retrying request")
                 continue
 
             elif response.status_code == 403:
@@ -277,18 +269,16 @@ async def make_graph_request(url: str, headers: dict, ait_id: str):
             elif response.status_code == 429:
                 logging.warning("Received 429 Too Many Requests. Retrying after delay...")
                 if attempt < max_retries - 1:
-                    import time
                     delay = 2 ** attempt
                     logging.info(f"Sleeping for {delay} seconds before retry")
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                     continue
                 return None, JSONResponse({"error": "Rate limit exceeded. Please try again later."}, status_code=429)
 
             elif response.status_code >= 500:
                 logging.warning(f"Received {response.status_code} Server Error. Retrying...")
                 if attempt < max_retries - 1:
-                    import time
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     continue
                 return None, JSONResponse({"error": "Microsoft Graph service temporarily unavailable."}, status_code=503)
 
@@ -299,13 +289,13 @@ async def make_graph_request(url: str, headers: dict, ait_id: str):
                     "details": response.text[:500]
                 }, status_code=response.status_code)
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logging.warning("Request timed out.")
             if attempt < max_retries - 1:
                 continue
             return None, JSONResponse({"error": "Request timeout. Please try again."}, status_code=408)
 
-        except requests.exceptions.RequestException as e:
+        except httpx.RequestError as e:
             logging.error(f"RequestException occurred: {str(e)}")
             if attempt < max_retries - 1:
                 continue
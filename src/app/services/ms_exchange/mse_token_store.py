@@ -7,15 +7,6 @@ import json
 from src.database.sql import AsyncMySQLDatabase 
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("msexchange_token_store.log"),
-        logging.StreamHandler()
-    ]
-)
-
 load_dotenv(override=True)
 
 AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")
@@ -23,8 +14,10 @@ AZURE_SECRET_ID = os.getenv("AZURE_SECRET_VALUE")
 TENANT_ID = os.getenv("TENANT_ID")
 AUTHORITY = f"https://login.microsoftonline.com/common"
 
-# MySQL setup for both token storage and email storage
+# MySQL setup for both token storage and email storage; the pool is opened once at application startup
 mysql_db = AsyncMySQLDatabase()
+# Static master_service row, looked up once per process
+_mse_service_id = None
 
 GRAPH_SCOPES = ["Mail.ReadWrite","Calendars.ReadWrite","Contacts.ReadWrite"]
 
@@ -35,77 +28,59 @@ msal_app = ConfidentialClientApplication(
 )
 
 async def get_mse_service_id():
-    await mysql_db.create_pool()
-    service_id = await mysql_db.select_one(table ="master_service", columns = "id", where= "service_name = 'MSExchange'")
-    await mysql_db.close_pool()
-    return service_id.get("id")
+    global _mse_service_id
+    if _mse_service_id is None:
+        service_id = await mysql_db.select_one(table ="master_service", columns = "id", where= "service_name = %s", params=("MSExchange",))
+        _mse_service_id = service_id.get("id")
+    return _mse_service_id
 
 async def save_token(ait_id, token_data):
     """Save token data to MySQL user_services table"""
     try:
         service_id = await get_mse_service_id()
-
-        await mysql_db.create_pool()
         
         auth_secret_json = json.dumps(token_data)
         current_time = datetime.now(timezone.utc)
         
-        existing_record = await mysql_db.select_one(
+        # Single round-trip: relies on the (custom_gpt_id, service_id) unique key added by
+        # src/database/migrations/001_user_services_custom_gpt_id_service_id_unique.sql
+        await mysql_db.upsert(
             table="user_services",
-            where="custom_gpt_id = %s AND service_id = %s",
-            params=(ait_id, service_id)
-        )
-        
-        if existing_record:
-            update_data = {
-                "auth_secret": auth_secret_json,
-                "updated_at": current_time
-            }
-            await mysql_db.update(
-                table="user_services",
-                data=update_data,
-                where="custom_gpt_id = %s AND service_id = %s",
-                where_params=(ait_id, service_id)
-            )
-        else:
-            # Insert new record
-            insert_data = {
+            data={
                 "custom_gpt_id": ait_id,
-                "service_id": service_id,  
+                "service_id": service_id,
                 "auth_secret": auth_secret_json,
                 "created_at": current_time,
                 "updated_at": current_time
-            }
-            await mysql_db.insert(table="user_services", data=insert_data)
+            },
+            update_cols=["auth_secret", "updated_at"]
+        )
             
     except Exception as e:
         logging.error(f"Error saving token: {e}")
-    finally:
-        await mysql_db.close_pool()
 
 async def get_token(ait_id):
     """Get token data from MySQL user_services table"""
     try:
         service_id = await get_mse_service_id()
-
-        await mysql_db.create_pool()
         
-        record = await mysql_db.select_one(
+        records = await mysql_db.select(
             table="user_services",
+            columns="auth_secret",
             where="custom_gpt_id = %s AND service_id = %s",
-            params=(ait_id, service_id)
+            params=(ait_id, service_id),
+            order_by="updated_at DESC, id DESC",
+            limit=1
         )
         
-        if record and record.get("auth_secret"):
+        if records and records[0].get("auth_secret"):
             # Parse JSON string back to dictionary
-            return json.loads(record["auth_secret"])
+            return json.loads(records[0]["auth_secret"])
         return None
         
     except Exception as e:
         logging.error(f"Error getting token: {e}")
         return None
-    finally:
-        await mysql_db.close_pool()
 
 async def refresh_access_token(ait_id : str):
     logging.info(f"Going to generate new access token for user id : {ait_id}")
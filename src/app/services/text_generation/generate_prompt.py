@@ -6,16 +6,6 @@ from openai import AsyncOpenAI
 from src.app.utils.prompts import meta_prompt
 META_PROMPT = meta_prompt.META_PROMPT
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("generate_prompt.log"),
-        logging.StreamHandler()
-    ]
-)
-
 api_key = os.getenv("OPENAI_API_KEY")
 client = AsyncOpenAI(api_key=api_key)
 
@@ -9,16 +9,6 @@ from src.app.services.text_processing.vector_search import search
 from src.app.services.trello_service.trello_document_search import search_trello_documents
 from src.app.utils.trello_utils import trello_system_prompt
 from src.app.utils.ms_email_utils import get_msemail_prompt
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("generate_response.log"),
-        logging.StreamHandler()
-    ]
-)
-
 # Load environment variables
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
@@ -26,6 +16,7 @@ api_key = os.getenv("OPENAI_API_KEY")
 # Initialize OpenAI async client
 client = AsyncOpenAI(api_key=api_key)
 
+# The pool is opened once at application startup
 db = AsyncMySQLDatabase()
 
 
@@ -42,9 +33,7 @@ async def generate_chat_completion(ait_id:str, query:str):
     try:
         logging.info("Starting chat completion generation.")
         try:
-            await db.create_pool()
-            db_response = await db.select(table="custom_gpts", columns="*", where=f"id = '{ait_id}'", limit=1)
-            await db.close_pool()
+            db_response = await db.select(table="custom_gpts", columns="*", where="id = %s", params=(ait_id,), limit=1)
         except Exception as e:
             logging.error(f"Database connection error: {str(e)}")
             return {'status': False, 'message': f"Database connection error: {str(e)}"}
@@ -87,13 +76,13 @@ async def generate_chat_completion(ait_id:str, query:str):
         # Search Trello documents
         try:
             extract_trello_data = await search_trello_documents(query, ait_id)
-            logging.info(f"Extracted Trello data: {extract_trello_data}")
+            logging.debug("Extracted Trello data: %s", extract_trello_data)
         except Exception as e:
             logging.error(f"Error searching Trello documents: {str(e)}")
             extract_trello_data = {}
 
         trello_data_item = [v for k, v in extract_trello_data.items()]
-        logging.info(f"Trello data items: {trello_data_item}")
+        logging.debug("Trello data items: %s", trello_data_item)
 
         extracted_mse_email = await search(
             ait_id=ait_id,
@@ -104,7 +93,8 @@ async def generate_chat_completion(ait_id:str, query:str):
             )
 
         bib_log_context_results = extracted_bib.get("results", []) + extracted_log.get("results", [])
-        logging.info(f"Context results: {bib_log_context_results}")
+        logging.info("Context results count=%d", len(bib_log_context_results))
+        logging.debug("Context results: %s", bib_log_context_results)
 
         messages = [
             {"role": "system", "content": f"{system_prompt}\n\n# Trello Data Handling\n{trello_system_prompt()}\n\n# Email Data Handling\n{get_msemail_prompt()}"},
@@ -1,11 +1,16 @@
 import os
+import asyncio
 import logging
 from dotenv import load_dotenv
 import nltk
 
-nltk.download('punkt')
+# Only hit the network when the tokenizer data is not already installed
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    nltk.download('punkt', quiet=True)
 
-from langchain_community.embeddings import SentenceTransformerEmbeddings
+from src.app.utils.embeddings import get_embedding_model
 from langchain_qdrant import QdrantVectorStore
 from langchain.indexes import index
 
@@ -21,15 +26,8 @@ load_dotenv()
 MODEL_NAME = os.getenv("MODEL_NAME", "text-embedding-ada-002")
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("google_oauth.log"),
-        logging.StreamHandler()
-    ]
-)
+# Documents handed to the embedding model per indexing step
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "256"))
 
 async def process_and_build_index(ait_id, file_names, document_collection, destination, messages=None):
     """
@@ -141,7 +139,7 @@ async def process_and_build_index(ait_id, file_names, document_collection, desti
         logging.info(f"Loaded {len(documents)} email documents for indexing.")
     # 2. Create Embeddings of the chunks
     try:
-        embedding = SentenceTransformerEmbeddings(model_name=MODEL_NAME)
+        embedding = get_embedding_model(MODEL_NAME)
 
         qdrant_client = QdrantService(host=QDRANT_HOST, port=QDRANT_PORT)
         if not await qdrant_client.collection_exists(collection_name=ait_id):
@@ -165,13 +163,17 @@ async def process_and_build_index(ait_id, file_names, document_collection, desti
             "index_result": None
         }
     
-    # 5. Incremental indexing using LangChain's index function
-    result = index(
+    # 5. Incremental indexing using LangChain's index function.
+    # index() embeds and upserts in INDEX_BATCH_SIZE batches synchronously, so it runs in a
+    # worker thread to keep the event loop serving other requests during large syncs.
+    result = await asyncio.to_thread(
+        index,
         documents,
         record_manager,
         vectorstore,
         cleanup="scoped_full",  # or "full" for full sync
         source_id_key="source_id",  # Use a unique identifier for each document
+        batch_size=INDEX_BATCH_SIZE,
     )
     logging.info(f"Indexing result: {result}")
     return {
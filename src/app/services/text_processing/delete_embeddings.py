@@ -6,7 +6,7 @@ from src.database.sql_record_manager import sql_record_manager, delete_source_id
 from langchain_qdrant import QdrantVectorStore
 
 from dotenv import load_dotenv
-from langchain_community.embeddings import SentenceTransformerEmbeddings
+from src.app.utils.embeddings import get_embedding_model
 import csv
 import sqlite3
 
@@ -26,7 +26,7 @@ async def delete_file_index(ait_id, file_names, qdrant_collection):
         qdrant_collection (str): Qdrant collection name.
     """
     try:
-        embedding = SentenceTransformerEmbeddings(model_name=MODEL_NAME)
+        embedding = get_embedding_model(MODEL_NAME)
         qdrant_client = QdrantService(host=QDRANT_HOST, port=QDRANT_PORT)
         namespace = f"qdrant/{ait_id}"
         record_manager = sql_record_manager(namespace=namespace)
@@ -1,20 +1,38 @@
 import os
+import asyncio
 import mimetypes
 from langchain_core.documents import Document
 from src.app.utils.helpers import chunk_text, load_content_local_file
 import logging
 
+# Files extracted at once; image and audio files each make an OpenAI call
+MAX_CONCURRENT_LOCAL_FILES = int(os.getenv("MAX_CONCURRENT_LOCAL_FILES", "8"))
+
+async def _load_local_file(ait_id, file_name, semaphore, logger):
+    # Reading, tokenizing and media extraction are blocking, so they run off the event loop
+    async with semaphore:
+        logging.info(file_name)
+        file_path = os.path.join("temp", ait_id, file_name)
+        return await asyncio.to_thread(load_content_local_file, file_path, logger)
+
 async def load_local_documents(file_names, ait_id, document_collection, logger=None):
     """
     Loads and chunks documents from the local filesystem.
     """
     documents = []
     try:
-        for file_name in file_names:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOCAL_FILES)
+        content_responses = await asyncio.gather(
+            *(
+                _load_local_file(ait_id, file_name, semaphore, logger)
+                for file_name in file_names
+            ),
+            return_exceptions=True
+        )
+        for file_name, content_response in zip(file_names, content_responses):
             try:
-                logging.info(file_name)
-                file_path = os.path.join("temp", ait_id, file_name)
-                content_response = load_content_local_file(file_path, logger)
+                if isinstance(content_response, Exception):
+                    raise content_response
                 content_chunks = content_response.get('content_chunks')
                 for idx, chunk in enumerate(content_chunks):
                     documents.append(
@@ -43,4 +61,3 @@ async def load_local_documents(file_names, ait_id, document_collection, logger=N
         else:
             logging.error(f"Unexpected error in load_local_documents: {e}")
         return {"status": False, "documents": [], "error": str(e)}
-
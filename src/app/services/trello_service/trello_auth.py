@@ -1,40 +1,46 @@
 import os
 import json
+import time
+import orjson
 import logging
-from urllib.parse import urlencode
+from urllib.parse import urlencode, quote_plus
 from datetime import datetime, timezone
-from src.database.sql import AsyncMySQLDatabase
-from src.app.utils.trello_utils import get_trello_api_key, get_trello_service_id
+from src.app.utils.trello_utils import get_trello_api_key, get_trello_service_id, db
 from dotenv import load_dotenv
 load_dotenv(override=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("trello_auth.log"),
-        logging.StreamHandler()
-    ]
-)
-
 TRELLO_AUTH_BASE = "https://trello.com/1/authorize"
 TRELLO_REDIRECT_URI = os.getenv("TRELLO_REDIRECT_URI")
-db = AsyncMySQLDatabase()
+
+# Everything but return_url is constant, so the encoded prefix is built once per process
+_auth_url_prefix = None
+
+# Parsed tokens per ait_id; save_token/delete_token in this process invalidate immediately
+TRELLO_TOKEN_CACHE_TTL = int(os.getenv("TRELLO_TOKEN_CACHE_TTL", "300"))
+_token_cache = {}
+
+def invalidate_token(ait_id: str):
+    """
+    Drops the cached Trello token for `ait_id` so the next get_token reads MySQL.
+    """
+    _token_cache.pop(ait_id, None)
 
 async def generate_auth_url(ait_id: str) -> str:
     """
     Generate Trello OAuth authorization URL for a given user.
     """
-    TRELLO_API_KEY = await get_trello_api_key()
+    global _auth_url_prefix
+    if _auth_url_prefix is None:
+        TRELLO_API_KEY = await get_trello_api_key()
+        params = {
+            "expiration": "never",
+            "name": "TrelloAgentAccess",
+            "scope": "read,write",
+            "response_type": "token",
+            "key": TRELLO_API_KEY,
+        }
+        _auth_url_prefix = f"{TRELLO_AUTH_BASE}?{urlencode(params)}&return_url="
     redirect_with_user = f"{TRELLO_REDIRECT_URI}?ait_id={ait_id}"
-    params = {
-        "expiration": "never",
-        "name": "TrelloAgentAccess",
-        "scope": "read,write",
-        "response_type": "token",
-        "key": TRELLO_API_KEY,
-        "return_url": redirect_with_user,
-    }
-    return f"{TRELLO_AUTH_BASE}?{urlencode(params)}"
+    return _auth_url_prefix + quote_plus(redirect_with_user, safe="")
 
 async def save_token(ait_id: str, auth_data: dict):
     """
@@ -43,67 +49,60 @@ async def save_token(ait_id: str, auth_data: dict):
     """
     try:
         TRELLO_SERVICE_ID = await get_trello_service_id()
-        await db.create_pool()
-
-        existing_service = await db.select_one(
-            table="user_services",
-            where="custom_gpt_id = %s AND service_id = %s",
-            params=(ait_id, TRELLO_SERVICE_ID)
-        )
 
         auth_secret_json = json.dumps(auth_data)
         timestamp = datetime.now(timezone.utc)
 
-        if existing_service:
-            success = await db.update(
-                table="user_services",
-                data={
-                    "auth_secret": auth_secret_json,
-                    "updated_at": timestamp,
-                    "deleted_at": None  # ensure we "revive" soft-deleted tokens
-                },
-                where="custom_gpt_id = %s AND service_id = %s",
-                where_params=(ait_id, TRELLO_SERVICE_ID)
-            )
-        else:
-            success = await db.insert(
-                table="user_services",
-                data={
-                    "custom_gpt_id": ait_id,
-                    "service_id": TRELLO_SERVICE_ID,
-                    "auth_secret": auth_secret_json,
-                    "created_at": timestamp,
-                    "updated_at": timestamp
-                }
-            )
-
-        logging.info(f"Trello token {'updated' if existing_service else 'inserted'} for user {ait_id}")
+        # Single round-trip: relies on the (custom_gpt_id, service_id) unique key added by
+        # src/database/migrations/001_user_services_custom_gpt_id_service_id_unique.sql
+        success = await db.upsert(
+            table="user_services",
+            data={
+                "custom_gpt_id": ait_id,
+                "service_id": TRELLO_SERVICE_ID,
+                "auth_secret": auth_secret_json,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+                "deleted_at": None  # ensure we "revive" soft-deleted tokens
+            },
+            update_cols=["auth_secret", "updated_at", "deleted_at"]
+        )
+
+        invalidate_token(ait_id)
+        logging.info(f"Trello token saved for user {ait_id}")
         return success
 
     except Exception as e:
         logging.error(f"Error saving Trello token: {e}")
         return False
 
-    finally:
-        await db.close_pool()
-
 async def get_token(ait_id: str) -> dict | None:
     """
     Retrieve a user's Trello token (auth data as dict) from MySQL.
+    The token is reused for TRELLO_TOKEN_CACHE_TTL seconds.
     """
+    cached = _token_cache.get(ait_id)
+    if cached and time.monotonic() - cached[0] < TRELLO_TOKEN_CACHE_TTL:
+        return cached[1]
     try:
-        TRELLO_SERVICE_ID = await get_trello_service_id()
-        await db.create_pool()
-
-        service_record = await db.select_one(
-            table="user_services",
-            columns="auth_secret",
-            where="custom_gpt_id = %s AND service_id = %s AND deleted_at IS NULL",
-            params=(ait_id, TRELLO_SERVICE_ID)
+        # Resolve the Trello service row in the same query instead of a separate lookup
+        service_records = await db.execute_query(
+            """
+            SELECT us.auth_secret
+            FROM user_services us
+            JOIN master_service ms ON ms.id = us.service_id
+            WHERE ms.service_name = %s AND us.custom_gpt_id = %s AND us.deleted_at IS NULL
+            ORDER BY us.updated_at DESC, us.id DESC
+            LIMIT 1
+            """,
+            ("Trello", ait_id)
         )
 
-        if service_record:
-            return json.loads(service_record['auth_secret']).get("token")
+        if service_records:
+            token = orjson.loads(service_records[0]['auth_secret']).get("token")
+            if token:
+                _token_cache[ait_id] = (time.monotonic(), token)
+            return token
 
         logging.info(f"No Trello token found for user {ait_id}")
         return None
@@ -112,16 +111,12 @@ async def get_token(ait_id: str) -> dict | None:
         logging.error(f"Error retrieving Trello token: {e}")
         return None
 
-    finally:
-        await db.close_pool()
-
 async def delete_token(ait_id: str) -> bool:
     """
     Soft delete a user's Trello token in the DB.
     """
     try:
         TRELLO_SERVICE_ID = await get_trello_service_id()
-        await db.create_pool()
 
         success = await db.update(
             table="user_services",
@@ -130,6 +125,7 @@ async def delete_token(ait_id: str) -> bool:
             where_params=(ait_id, TRELLO_SERVICE_ID)
         )
 
+        invalidate_token(ait_id)
         if success:
             logging.info(f"Trello token deleted for user {ait_id}")
         else:
@@ -141,29 +137,24 @@ async def delete_token(ait_id: str) -> bool:
         logging.error(f"Error deleting Trello token: {e}")
         return False
 
-    finally:
-        await db.close_pool()
-
 async def is_user_authenticated(ait_id: str) -> bool:
     """
     Check if a user has an active Trello token.
     """
     try:
         TRELLO_SERVICE_ID = await get_trello_service_id()
-        await db.create_pool()
 
-        service_record = await db.select_one(
+        service_records = await db.select(
             table="user_services",
             columns="id",
             where="custom_gpt_id = %s AND service_id = %s AND deleted_at IS NULL",
-            params=(ait_id, TRELLO_SERVICE_ID)
+            params=(ait_id, TRELLO_SERVICE_ID),
+            order_by="updated_at DESC, id DESC",
+            limit=1
         )
 
-        return service_record is not None
+        return bool(service_records)
 
     except Exception as e:
         logging.error(f"Error checking authentication for user {ait_id}: {e}")
         return False
-
-    finally:
-        await db.close_pool()
\ No newline at end of file
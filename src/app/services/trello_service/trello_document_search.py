@@ -1,22 +1,103 @@
 import os
 import sys
+import time
+import asyncio
+import orjson
 sys.path.append(".")
 import logging
 from dotenv import load_dotenv
-import httpx
 
 load_dotenv(override=True)
 
 # Fix import paths as needed
 from src.app.services.trello_service.trello_query_extractor import trello_query_entities
+from src.app.utils.http_client import get_http_client
+from src.app.utils.trello_utils import TRELLO_API_BASE
 
 TRELLO_API_KEY = os.getenv("TRELLO_API_KEY")
 TRELLO_TOKEN = os.getenv("TRELLO_TOKEN")
-BACKEND_API_URL = os.getenv("BACKEND_API_URL")
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+BACKEND_API_URL = os.getenv("BACKEND_API_URL", "http://localhost:8080").rstrip("/")
+# Every collection search goes to the same origin so the shared client reuses one keep-alive pool
+SEARCH_API_URL = f"{BACKEND_API_URL}/search"
 logger = logging.getLogger(__name__)
 
+# /members/me is stable for a given token, so it is cached instead of fetched on every search
+TRELLO_USER_CACHE_TTL = int(os.getenv("TRELLO_USER_CACHE_TTL", "300"))
+_trello_me_cache = {}
+
+async def _get_trello_me(token):
+    """
+    Fetches the Trello user for `token`, reusing a cached copy for TRELLO_USER_CACHE_TTL seconds.
+    A stale copy is served if Trello answers with a 5xx error.
+
+    Returns:
+        dict | None: The user JSON, or None if it could not be fetched.
+    """
+    cached = _trello_me_cache.get(token)
+    if cached and time.monotonic() - cached[0] < TRELLO_USER_CACHE_TTL:
+        return cached[1]
+
+    client = get_http_client()
+    response = await client.get(
+        f"{TRELLO_API_BASE}/members/me",
+        params={"key": TRELLO_API_KEY, "token": token}
+    )
+    if response.status_code == 200:
+        user_json = orjson.loads(response.content)
+        _trello_me_cache[token] = (time.monotonic(), user_json)
+        return user_json
+    if cached and response.status_code >= 500:
+        logger.warning(f"Trello user fetch failed with {response.status_code}, using cached user")
+        return cached[1]
+    logger.warning(f"Trello user fetch failed: {response.text}")
+    return None
+
+async def _search_collection(ait_id, collection, query, limit, similarity_threshold):
+    """
+    Runs one vector search against the backend for a single Trello collection.
+
+    Returns:
+        list: Matching results, or an empty list if the search failed.
+    """
+    try:
+        client = get_http_client()
+        response = await client.post(
+            SEARCH_API_URL,
+            json={
+                "ait_id": ait_id,
+                "query": query,
+                "document_collection": collection,
+                "limit": limit,
+                "similarity_threshold": similarity_threshold
+            }
+        )
+        if response.status_code == 200:
+            results = orjson.loads(response.content).get("results", [])
+            logger.info(f"{collection} search returned {len(results)} results")
+            return results
+        logger.warning(f"{collection} search failed: {response.text}")
+    except Exception as e:
+        logger.error(f"Error searching {collection}: {e}")
+    return []
+
+async def _search_trello_user():
+    """
+    Returns the current Trello user as a single-item document list, or an empty list on failure.
+    """
+    try:
+        user_json = await _get_trello_me(TRELLO_TOKEN)
+        if user_json:
+            logger.info("Fetched Trello user info successfully")
+            return [{
+                "username": user_json.get("username", ""),
+                "fullName": user_json.get("fullName", ""),
+                "id": user_json.get("id", ""),
+                "url": user_json.get("url", "")
+            }]
+    except Exception as e:
+        logger.error(f"Error fetching Trello user: {e}")
+    return []
+
 async def search_trello_documents(query: str, ait_id: str, limit: int = 10, similarity_threshold: float = 0.3) -> dict:
     """
     Search Trello documents based on the provided query.
@@ -35,92 +116,18 @@ async def search_trello_documents(query: str, ait_id: str, limit: int = 10, simi
         log_entity_string = await trello_query_entities(query=query)
         logger.info(f"Entity string from trello_query_entities: {log_entity_string}")
 
-        trello_log_documents = []
-        trello_card_documents = []
-        trello_member_documents = []
-        trello_user_documents = []
-
-        async with httpx.AsyncClient() as client:
-            # Search trello_log
-            try:
-                trello_log_response = await client.post(
-                    f"{BACKEND_API_URL}/search",
-                    json={
-                        "ait_id": ait_id,
-                        "query": log_entity_string,
-                        "document_collection": "trello_log",
-                        "limit": 30,
-                        "similarity_threshold": 0.4
-                    }
-                )
-                if trello_log_response.status_code == 200:
-                    trello_log_documents = trello_log_response.json().get("results", [])
-                    logger.info(f"trello_log search returned {len(trello_log_documents)} results")
-                else:
-                    logger.warning(f"trello_log search failed: {trello_log_response.text}")
-            except Exception as e:
-                logger.error(f"Error searching trello_log: {e}")
-
-            # Search trello_card
-            try:
-                trello_card_response = await client.post(
-                    f"{BACKEND_API_URL}/search",
-                    json={
-                        "ait_id": ait_id,
-                        "query": query,
-                        "document_collection": "trello_card",
-                        "limit": 20,
-                        "similarity_threshold": 0.2
-                    }
-                )
-                if trello_card_response.status_code == 200:
-                    trello_card_documents = trello_card_response.json().get("results", [])
-                    logger.info(f"trello_card search returned {len(trello_card_documents)} results")
-                else:
-                    logger.warning(f"trello_card search failed: {trello_card_response.text}")
-            except Exception as e:
-                logger.error(f"Error searching trello_card: {e}")
-
-            # Search trello_member
-            try:
-                trello_member_response = await client.post(
-                    f"{BACKEND_API_URL}/search",
-                    json={
-                        "ait_id": ait_id,
-                        "query": query,
-                        "document_collection": "trello_member",
-                        "limit": 10,
-                        "similarity_threshold": 0.2
-                    }
-                )
-                if trello_member_response.status_code == 200:
-                    trello_member_documents = trello_member_response.json().get("results", [])
-                    logger.info(f"trello_member search returned {len(trello_member_documents)} results")
-                else:
-                    logger.warning(f"trello_member search failed: {trello_member_response.text}")
-            except Exception as e:
-                logger.error(f"Error searching trello_member: {e}")
-
-            # Get Trello user info
-            try:
-                trello_user_response = await client.get(
-                    f"https://trello.com/1/members/me?token={TRELLO_TOKEN}&key={TRELLO_API_KEY}"
-                )
-                if trello_user_response.status_code == 200:
-                    user_json = trello_user_response.json()
-                    trello_user_documents = [{
-                        "username": user_json.get("username", ""),
-                        "fullName": user_json.get("fullName", ""),
-                        "id": user_json.get("id", ""),
-                        "url": user_json.get("url", "")
-                    }]
-                    logger.info("Fetched Trello user info successfully")
-                else:
-                    logger.warning(f"Trello user fetch failed: {trello_user_response.text}")
-                    trello_user_documents = []
-            except Exception as e:
-                logger.error(f"Error fetching Trello user: {e}")
-                trello_user_documents = []
+        # The collections are independent, so the searches and the user lookup are overlapped
+        (
+            trello_log_documents,
+            trello_card_documents,
+            trello_member_documents,
+            trello_user_documents,
+        ) = await asyncio.gather(
+            _search_collection(ait_id, "trello_log", log_entity_string, limit=30, similarity_threshold=0.4),
+            _search_collection(ait_id, "trello_card", query, limit=20, similarity_threshold=0.2),
+            _search_collection(ait_id, "trello_member", query, limit=10, similarity_threshold=0.2),
+            _search_trello_user(),
+        )
 
         trello_documents = {
             "trello_log": trello_log_documents,
@@ -1,7 +1,7 @@
 import os
 import asyncio
-import httpx
 import logging
+import orjson
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional
 
@@ -16,47 +16,207 @@ from src.app.utils.trello_utils import (
     get_trello_user_board,
     get_trello_user,
     get_trello_members,
+    trello_get,
+    trello_stream_items,
+    TRELLO_API_BASE,
 )
 
 from src.app.services.trello_service import trello_auth 
 
 trello_api = os.getenv("TRELLO_API_KEY", None)
 
+# Trello's maximum page size for board actions
+_TRELLO_PAGE_SIZE = 1000
+# Sparse fieldsets: only what the text builders and metadata helpers read is transferred and parsed.
+# Credentials are merged in per request and the dicts are passed to httpx as params.
+_TRELLO_ACTION_PARAMS = {
+    "limit": _TRELLO_PAGE_SIZE,
+    # Comma-separated action types to index, e.g. "createCard,updateCard,commentCard"
+    "filter": os.getenv("TRELLO_ACTION_FILTER", "all"),
+    "fields": "id,idMemberCreator,type,date,data",
+    "memberCreator_fields": "fullName,username",
+}
+_TRELLO_CARD_PARAMS = {
+    "fields": "name,idBoard,idList,desc,idMembers,idLabels,idChecklists,"
+              "idAttachmentCover,due,dueComplete,dateLastActivity,shortUrl",
+}
+# Parse board actions and cards while they download instead of after the whole body arrives (needs ijson)
+TRELLO_STREAM_JSON = os.getenv("TRELLO_STREAM_JSON", "false").lower() in ("1", "true", "yes")
+# Items handed to the Document builder at a time when streaming
+_STREAM_BATCH_SIZE = 200
+
+# Shared read-only fallback for missing nested objects; never mutate
+_EMPTY = {}
+
+def _shared(value, strings):
+    """
+    Deduplicates string metadata values that repeat across many documents
+    (board/list/card ids and names, member names) through the per-sync
+    `strings` dict, so every document points at one copy instead of its own
+    parsed string. The dict is dropped with the sync, so nothing outlives it.
+    """
+    return strings.setdefault(value, value) if isinstance(value, str) else value
+
+def _log_metadata(log, ait_id, document_collection, strings):
+    data = log.get("data") or _EMPTY
+    card = data.get("card") or _EMPTY
+    board = data.get("board") or _EMPTY
+    trello_list = data.get("list") or _EMPTY
+    return {
+        "ait_id": ait_id,
+        "type": document_collection,
+        "source_id": log.get("id"),
+        "card_id": _shared(data.get("idCard"), strings),
+        "card_name": _shared(card.get("name"), strings),
+        "board_id": _shared(board.get("id"), strings),
+        "board_name": _shared(board.get("name"), strings),
+        "list_id": _shared(trello_list.get("id"), strings),
+        "list_name": _shared(trello_list.get("name"), strings),
+        "member_creator": _shared((log.get("memberCreator") or _EMPTY).get("fullName"), strings),
+        "date": log.get("date"),
+    }
+
+def _user_metadata(user, ait_id, document_collection):
+    get = user.get
+    return {
+        "ait_id": ait_id,
+        "type": document_collection,
+        "source_id": get("id"),
+        "full_name": get("fullName"),
+        "username": get("username"),
+        "email": get("email"),
+        "bio": get("bio"),
+        "url": get("url"),
+    }
+
+def _card_metadata(card, ait_id, document_collection, strings):
+    get = card.get
+    card_id = get("id")
+    return {
+        "ait_id": ait_id,
+        "type": document_collection,
+        "source_id": card_id,
+        "card_id": card_id,
+        "card_name": get("name"),
+        "board_id": _shared(get("idBoard"), strings),
+        "list_id": _shared(get("idList"), strings),
+        "date_last_activity": get("dateLastActivity"),
+        "due": get("due"),
+        "due_complete": get("dueComplete"),
+        "short_url": get("shortUrl"),
+    }
+
+def _member_metadata(member, ait_id, document_collection):
+    get = member.get
+    return {
+        "ait_id": ait_id,
+        "type": document_collection,
+        "source_id": get("id"),
+        "members_name": get("fullName"),
+        "members_username": get("username")
+    }
+
+def _build_log_documents(logs, ait_id, document_collection, strings):
+    return [
+        Document(
+            page_content=build_log_text(log).strip(),
+            metadata=_log_metadata(log, ait_id, document_collection, strings)
+        )
+        for log in logs
+    ]
+
+def _build_card_documents(cards, ait_id, document_collection, strings):
+    return [
+        Document(
+            page_content=build_card_text(card).strip(),
+            metadata=_card_metadata(card, ait_id, document_collection, strings)
+        )
+        for card in cards
+    ]
+
+def _build_member_documents(members_lists, ait_id, document_collection):
+    return [
+        Document(
+            page_content=build_member_text(member).strip(),
+            metadata=_member_metadata(member, ait_id, document_collection)
+        )
+        for members_response in members_lists
+        for member in members_response
+    ]
+
+async def _iter_response_batches(url, params):
+    """
+    Yields the elements of one Trello JSON array response in batches.
+    With TRELLO_STREAM_JSON the body is parsed while it downloads and yielded in
+    _STREAM_BATCH_SIZE slices; otherwise the whole response is one batch.
+    """
+    if TRELLO_STREAM_JSON:
+        batch = []
+        async for item in trello_stream_items(url, params=params):
+            batch.append(item)
+            if len(batch) == _STREAM_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    else:
+        response = await trello_get(url, params=params)
+        page = orjson.loads(response.content)
+        if page:
+            yield page
+
+async def _iter_action_batches(url, params):
+    """
+    Yields a board's actions in batches, following before= cursors until the board is exhausted.
+    """
+    while True:
+        page_size = 0
+        last_action = None
+        async for batch in _iter_response_batches(url, params):
+            page_size += len(batch)
+            last_action = batch[-1]
+            yield batch
+        # Actions are returned newest first; page backwards from the oldest one seen
+        if page_size < _TRELLO_PAGE_SIZE:
+            return
+        params = {**params, "before": last_action["id"]}
+
 async def load_trello_log(ait_id, document_collection, trello_board_documents,trello_api, user_token):
     """
     Converts Trello logs to a list of Document objects for embedding.
     Each chunk gets the log's id as source_id.
     """
     documents = []
+    if not trello_board_documents:
+        return documents
     try:
-        for board_id in trello_board_documents:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"https://trello.com/1/boards/{board_id}/actions?limit=1000&key={trello_api}&token={user_token}")
-                response.raise_for_status()
-                logs = response.json()
-                logging.info(f"Loaded {len(logs)} logs for board {board_id}")
-                if asyncio.iscoroutine(logs):
-                    logs = await logs
-                for log in logs:
-                    text = build_log_text(log)
-                    documents.append(
-                        Document(
-                            page_content=text.strip(),
-                            metadata={
-                                "ait_id": ait_id,
-                                "type": document_collection,
-                                "source_id": log.get("id"),
-                                "card_id": log.get("data", {}).get("idCard"),
-                                "card_name": log.get("data", {}).get("card", {}).get("name"),
-                                "board_id": log.get("data", {}).get("board", {}).get("id"),
-                                "board_name": log.get("data", {}).get("board", {}).get("name"),
-                                "list_id": log.get("data", {}).get("list", {}).get("id"),
-                                "list_name": log.get("data", {}).get("list", {}).get("name"),
-                                "member_creator": log.get("memberCreator", {}).get("fullName"),
-                                "date": log.get("date"),
-                            }
-                        )
-                    )
+        action_params = {**_TRELLO_ACTION_PARAMS, "key": trello_api, "token": user_token}
+        # Repeated metadata strings are shared across this sync's documents only
+        strings = {}
+
+        # Each batch is turned into Documents as soon as it is parsed, so only one raw
+        # page per board is alive at a time instead of every board's full payload
+        async def _load_board_logs(board_id):
+            url = f"{TRELLO_API_BASE}/boards/{board_id}/actions"
+            board_documents = []
+            async for batch in _iter_action_batches(url, action_params):
+                # Building thousands of Documents is pure Python, so it runs in a worker
+                # thread to keep the loop free for the other boards' responses
+                board_documents.extend(
+                    await asyncio.to_thread(_build_log_documents, batch, ait_id, document_collection, strings)
+                )
+            logging.info(f"Loaded {len(board_documents)} logs for board {board_id}")
+            return board_documents
+
+        results = await asyncio.gather(
+            *[_load_board_logs(board_id) for board_id in trello_board_documents],
+            return_exceptions=True
+        )
+        for board_id, board_documents in zip(trello_board_documents, results):
+            if isinstance(board_documents, Exception):
+                logging.error(f"Error loading Trello logs for board {board_id}: {board_documents}")
+                continue
+            documents.extend(board_documents)
     except Exception as e:
         logging.error(f"Error loading Trello logs: {e}")
     return documents
@@ -68,22 +228,13 @@ async def load_trello_user(ait_id, document_collection, trello_api, user_token):
     """
     documents = []
     try:
-        user_response = await get_trello_user(trello_api, user_token)
+        user_response = await get_trello_user(trello_api, user_token, use_cache=False)
         if user_response:
             text = build_user_text(user_response)
             documents.append(
                 Document(
                     page_content=text.strip(),
-                    metadata={
-                        "ait_id": ait_id,
-                        "type": document_collection,
-                        "source_id": user_response.get("id"),
-                        "full_name": user_response.get("fullName"),
-                        "username": user_response.get("username"),
-                        "email": user_response.get("email"),
-                        "bio": user_response.get("bio"),
-                        "url": user_response.get("url"),
-                    }
+                    metadata=_user_metadata(user_response, ait_id, document_collection)
                 )
             )
     except Exception as e:
@@ -96,34 +247,30 @@ async def load_trello_card(ait_id, document_collection, trello_board_documents,
     Each chunk gets the card's id as source_id.
     """
     documents = []
+    if not trello_board_documents:
+        return documents
     try:
-        for board_id in trello_board_documents:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"https://trello.com/1/boards/{board_id}/cards?limit=1000&key={trello_api}&token={user_token}")
-                response.raise_for_status()
-                cards_response = response.json()
-                if asyncio.iscoroutine(cards_response):
-                    cards_response = await cards_response
-                for card in cards_response:
-                    text = build_card_text(card)
-                    documents.append(
-                        Document(
-                            page_content=text.strip(),
-                            metadata={
-                                "ait_id": ait_id,
-                                "type": document_collection,
-                                "source_id": card.get("id"),
-                                "card_id": card.get("id"),
-                                "card_name": card.get("name"),
-                                "board_id": card.get("idBoard"),
-                                "list_id": card.get("idList"),
-                                "date_last_activity": card.get("dateLastActivity"),
-                                "due": card.get("due"),
-                                "due_complete": card.get("dueComplete"),
-                                "short_url": card.get("shortUrl"),
-                            }
-                        )
-                    )
+        card_params = {**_TRELLO_CARD_PARAMS, "key": trello_api, "token": user_token}
+        # Repeated metadata strings are shared across this sync's documents only
+        strings = {}
+
+        async def _load_board_cards(board_id):
+            board_documents = []
+            async for batch in _iter_response_batches(f"{TRELLO_API_BASE}/boards/{board_id}/cards", card_params):
+                board_documents.extend(
+                    await asyncio.to_thread(_build_card_documents, batch, ait_id, document_collection, strings)
+                )
+            return board_documents
+
+        results = await asyncio.gather(
+            *[_load_board_cards(board_id) for board_id in trello_board_documents],
+            return_exceptions=True
+        )
+        for board_id, board_documents in zip(trello_board_documents, results):
+            if isinstance(board_documents, Exception):
+                logging.error(f"Error loading Trello cards for board {board_id}: {board_documents}")
+                continue
+            documents.extend(board_documents)
         logging.info(f"length of board cards {len(documents)}")
     except Exception as e:
         logging.error(f"Error loading Trello cards: {e}")
@@ -135,23 +282,11 @@ async def load_trello_member(ait_id, document_collection, trello_board_documents
     Each chunk gets the member's id as source_id.
     """
     documents = []
+    if not trello_board_documents:
+        return documents
     try:
-        members_lists = await get_trello_members(trello_board_documents, trello_api, user_token)
-        for members_response in members_lists:
-            for member in members_response:
-                text = build_member_text(member)
-                documents.append(
-                    Document(
-                        page_content=text.strip(),
-                        metadata={
-                            "ait_id": ait_id,
-                            "type": document_collection,
-                            "source_id": member.get("id"),
-                            "members_name": member.get("fullName"),
-                            "members_username": member.get("username")
-                        }
-                    )
-                )
+        members_lists = await get_trello_members(trello_board_documents, trello_api, user_token, use_cache=False)
+        documents = await asyncio.to_thread(_build_member_documents, members_lists, ait_id, document_collection)
         logging.info(f"length of board members {len(documents)}")
     except Exception as e:
         logging.error(f"Error loading Trello members: {e}")
@@ -159,12 +294,22 @@ async def load_trello_member(ait_id, document_collection, trello_board_documents
 
 async def load_trello_boards(trello_api, user_token):
     try:
-        board_id = await get_trello_user_board(trello_api, user_token)
+        board_id = await get_trello_user_board(trello_api, user_token, use_cache=False)
         logging.info(f"Board ids {board_id}")
         return board_id
     except Exception as e:
         return e        
 
+async def _run_loader(name, loader):
+    # Awaits one top-level loader so that a failure costs only its own documents
+    try:
+        documents = await loader
+    except Exception as e:
+        logging.error(f"Error loading Trello {name} documents: {e}")
+        return []
+    logging.info(f"Loaded {len(documents)} Trello {name} documents.")
+    return documents
+
 async def load_trello_documents(ait_id, logger=None):
     try:
         user_token = await trello_auth.get_token(ait_id)
@@ -180,41 +325,62 @@ async def load_trello_documents(ait_id, logger=None):
             error_msg = f"Error loading Trello boards: {trello_board_documents}"
             logging.error(error_msg)
             return {"status": False, "error": error_msg}
-        trello_user_documents = await load_trello_user(
-            ait_id=ait_id,
-            document_collection="trello_user",
-            trello_api=trello_api,
-            user_token=user_token
-        )
-        logging.info(f"Loaded {len(trello_user_documents)} Trello user documents.")
-        trello_card_documents = await load_trello_card(
-            ait_id=ait_id,
-            document_collection="trello_card",
-            trello_board_documents=trello_board_documents,
-            trello_api=trello_api,
-            user_token=user_token
-        )
-        logging.info(f"Loaded {len(trello_card_documents)} Trello card documents.")
-        trello_log_documents = await load_trello_log(
-            ait_id=ait_id,
-            document_collection="trello_log",
-            trello_board_documents=trello_board_documents,
-            trello_api=trello_api,
-            user_token=user_token
-        )
-        logging.info(f"Loaded {len(trello_log_documents)} Trello log documents.")
-        trello_member_documents = await load_trello_member(
-            ait_id=ait_id,
-            document_collection="trello_member",
-            trello_board_documents=trello_board_documents,
-            trello_api=trello_api,
-            user_token=user_token
+        if not trello_board_documents:
+            logging.info("No Trello boards found, only the user document will be loaded.")
+        # The four loaders share no state, so their requests are overlapped
+        (
+            trello_user_documents,
+            trello_card_documents,
+            trello_log_documents,
+            trello_member_documents,
+        ) = await asyncio.gather(
+            _run_loader(
+                "user",
+                load_trello_user(
+                    ait_id=ait_id,
+                    document_collection="trello_user",
+                    trello_api=trello_api,
+                    user_token=user_token
+                )
+            ),
+            _run_loader(
+                "card",
+                load_trello_card(
+                    ait_id=ait_id,
+                    document_collection="trello_card",
+                    trello_board_documents=trello_board_documents,
+                    trello_api=trello_api,
+                    user_token=user_token
+                )
+            ),
+            _run_loader(
+                "log",
+                load_trello_log(
+                    ait_id=ait_id,
+                    document_collection="trello_log",
+                    trello_board_documents=trello_board_documents,
+                    trello_api=trello_api,
+                    user_token=user_token
+                )
+            ),
+            _run_loader(
+                "member",
+                load_trello_member(
+                    ait_id=ait_id,
+                    document_collection="trello_member",
+                    trello_board_documents=trello_board_documents,
+                    trello_api=trello_api,
+                    user_token=user_token
+                )
+            ),
         )
-        logging.info(f"Loaded {len(trello_member_documents)} Trello member documents.")
-        
-        trello_documents = trello_user_documents + trello_card_documents + trello_log_documents + trello_member_documents
+        # Grow one list in place rather than building an intermediate list per `+`
+        trello_documents = trello_user_documents
+        trello_documents.extend(trello_card_documents)
+        trello_documents.extend(trello_log_documents)
+        trello_documents.extend(trello_member_documents)
         
-        logging.info(f"Total Trello documents loaded: {len(trello_user_documents) + len(trello_card_documents) + len(trello_log_documents) + len(trello_member_documents)}")
+        logging.info(f"Total Trello documents loaded: {len(trello_documents)}")
         return {"status": True, "documents": trello_documents}
     except Exception as e:
         error_msg = f"Exception in load_trello_documents: {str(e)}"
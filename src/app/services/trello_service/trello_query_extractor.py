@@ -11,7 +11,6 @@ from openai import AsyncOpenAI
 
 from src.app.utils.trello_utils import (
     get_trello_user_board,
-    get_trello_user,
     get_trello_members,
     read_metadata,
     trello_extract_entities_prompt,
@@ -26,6 +25,9 @@ TRELLO_API_KEY = os.getenv("TRELLO_API_KEY") #Later fetch from the Database
 TRELLO_TOKEN = os.getenv("TRELLO_TOKEN") #Later fetch from the Database
 METADATA_FILE_PATH = os.getenv("METADATA_FILE_PATH")
 
+# Shared so every query reuses the same underlying HTTP connection pool
+client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
 async def trello_query_entities(
     query,
     api_key=TRELLO_API_KEY,
@@ -41,13 +43,6 @@ async def trello_query_entities(
         logging.error(f"Error fetching Trello board IDs: {e}")
         return None
 
-    try:
-        trello_user_data = await get_trello_user(api_key=api_key, token=token)
-        # logging.info(f"Fetched Trello user data: {trello_user_data}")
-    except Exception as e:
-        logging.error(f"Error fetching Trello user data: {e}")
-        return None
-
     try:
         trello_board_member_data = await get_trello_members(board_ids=board_ids, api_key=api_key, token=token)
         # logging.info(f"Fetched Trello board members: {trello_board_member_data}")
@@ -75,8 +70,8 @@ async def trello_query_entities(
         return None
 
     try:
-        client = AsyncOpenAI(api_key=openai_api_key)
-        response = await client.chat.completions.create(
+        llm_client = client if openai_api_key == OPENAI_API_KEY else AsyncOpenAI(api_key=openai_api_key)
+        response = await llm_client.chat.completions.create(
             model="gpt-4.1",
             messages=[
                 {"role": "user", "content": trello_extract_prompt}
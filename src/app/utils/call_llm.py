@@ -1,20 +1,48 @@
 import os
+import time
+import asyncio
 import logging
+import importlib.util
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
+try:
+    from openai import DefaultAioHttpClient
+except ImportError:  # openai releases without the aiohttp backend
+    DefaultAioHttpClient = None
+
 api_key = os.getenv("OPENAI_API_KEY")
-client = AsyncOpenAI(api_key=api_key)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("call_llm.log"),
-        logging.StreamHandler()
-    ]
-)
+# The SDK retries 429s, timeouts and 5xx with exponential backoff (honouring Retry-After)
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+# Caps in-flight completions and paces request starts to stay under the account's RPM limit
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "20"))
+OPENAI_MAX_RPM = int(os.getenv("OPENAI_MAX_RPM", "500"))
+_openai_semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+_rate_lock = asyncio.Lock()
+_next_request_at = 0.0
+
+# The aiohttp transport (openai[aiohttp]) keeps scaling where the default httpx pool
+# stalls under many concurrent completions; fall back to httpx when it is not installed
+if DefaultAioHttpClient is not None and importlib.util.find_spec("httpx_aiohttp") is not None:
+    client = AsyncOpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, http_client=DefaultAioHttpClient())
+else:
+    client = AsyncOpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES)
+
+async def _wait_for_request_slot():
+    """
+    Spaces request starts 60 / OPENAI_MAX_RPM seconds apart so bursts queue here
+    instead of being rejected with 429s. Disabled when OPENAI_MAX_RPM is 0.
+    """
+    global _next_request_at
+    if OPENAI_MAX_RPM <= 0:
+        return
+    async with _rate_lock:
+        now = time.monotonic()
+        start_at = max(now, _next_request_at)
+        _next_request_at = start_at + 60 / OPENAI_MAX_RPM
+    if start_at > now:
+        await asyncio.sleep(start_at - now)
 
 async def call_chatgpt(system_prompt:str, user_query:str):
     try:
@@ -27,19 +55,21 @@ async def call_chatgpt(system_prompt:str, user_query:str):
 
         # Call the OpenAI API to generate the prompt asynchronously
         logging.info("Calling OpenAI API to generate the prompt.")
-        completion = await client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt,
-                },
-                {
-                    "role": "user",
-                    "content": user_query,
-                },
-            ],
-        )
+        async with _openai_semaphore:
+            await _wait_for_request_slot()
+            completion = await client.chat.completions.create(
+                model="gpt-4.1",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system_prompt,
+                    },
+                    {
+                        "role": "user",
+                        "content": user_query,
+                    },
+                ],
+            )
 
         prompt = completion.choices[0].message.content
         logging.info("Prompt successfully generated.")
@@ -56,4 +86,30 @@ async def call_chatgpt(system_prompt:str, user_query:str):
 
     except Exception as e:
         logging.error(f"An unexpected error occurred: {str(e)}")
-        return {'status': False, 'message': f"An unexpected error occurred: {str(e)}"}
\ No newline at end of file
+        return {'status': False, 'message': f"An unexpected error occurred: {str(e)}"}
+
+
+async def call_chatgpt_many(pairs):
+    """
+    Runs call_chatgpt for many (system_prompt, user_query) pairs concurrently.
+
+    Every pair is scheduled at once; the module-wide semaphore sized by
+    OPENAI_CONCURRENCY and the OPENAI_MAX_RPM pacing inside call_chatgpt are
+    the only limits, shared with all other callers. There is no per-call
+    concurrency argument, so tune those settings to the account's rate limits.
+
+    Args:
+        pairs (list): List of (system_prompt, user_query) tuples.
+
+    Returns:
+        list: One call_chatgpt result dict per pair, in order.
+    """
+    results = await asyncio.gather(
+        *(call_chatgpt(system_prompt, user_query) for system_prompt, user_query in pairs),
+        return_exceptions=True
+    )
+    return [
+        {'status': False, 'message': f"An unexpected error occurred: {str(result)}"}
+        if isinstance(result, BaseException) else result
+        for result in results
+    ]
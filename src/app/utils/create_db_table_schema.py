@@ -1,18 +1,9 @@
 import os
-import json
+import orjson
 import logging
 from typing import Dict
 from src.database.sql import AsyncMySQLDatabase  
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("create_db_tabe_schema.log"),
-        logging.StreamHandler()
-    ]
-)
-
 def truncate_example(value: str, word_limit: int = 25, char_limit: int = 100) -> str:
     if not value:
         return "None"
@@ -27,13 +18,23 @@ def truncate_example(value: str, word_limit: int = 25, char_limit: int = 100) ->
         return truncated.rstrip() + "..."
     return value
 
+# Parsed schema per (file, table), reused until the schema file changes on disk
+_schema_cache = {}
+
 async def get_or_create_schema_json(db: AsyncMySQLDatabase = AsyncMySQLDatabase(), 
                                     schema_file_path = "schema.json",
                                     table_name = "user_email_content") -> Dict[str, str]:
+    cache_key = (schema_file_path, table_name)
     if os.path.exists(schema_file_path):
+        mtime = os.path.getmtime(schema_file_path)
+        cached = _schema_cache.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached[1]
         logging.info(f"Schema file '{schema_file_path}' found. Loading existing schema.")
-        with open(schema_file_path, "r") as f:
-            return json.load(f)
+        with open(schema_file_path, "rb") as f:
+            schema = orjson.loads(f.read())
+        _schema_cache[cache_key] = (mtime, schema)
+        return schema
 
     logging.info("Schema file not found. Generating new schema.")
     await db.create_pool()
@@ -64,8 +65,9 @@ async def get_or_create_schema_json(db: AsyncMySQLDatabase = AsyncMySQLDatabase(
 
     schema = {table_name: schema}
     logging.info(f"Writing schema to '{schema_file_path}'...")
-    with open(schema_file_path, "w") as f:
-        json.dump(schema, f, indent=2)
+    with open(schema_file_path, "wb") as f:
+        f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+    _schema_cache[cache_key] = (os.path.getmtime(schema_file_path), schema)
 
     await db.close_pool()
     logging.info("Database connection pool closed.")
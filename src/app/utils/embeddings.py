@@ -0,0 +1,36 @@
+import os
+import logging
+import torch
+from functools import lru_cache
+from langchain_community.embeddings import SentenceTransformerEmbeddings
+
+# Texts per SentenceTransformer.encode batch; each batch is tokenized in one fast-tokenizer call
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+if device.type == "cuda":
+    # TF32 tensor-core matmuls on Ampere+ GPUs; no effect on older cards
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+
+@lru_cache(maxsize=None)
+def get_embedding_model(model_name: str) -> SentenceTransformerEmbeddings:
+    """
+    Returns a process-wide SentenceTransformer embedding model.
+
+    Loading the model from disk takes seconds, so it is loaded once per
+    model name and reused by indexing, search and deletion.
+
+    Args:
+        model_name (str): Name of the sentence-transformers model.
+
+    Returns:
+        SentenceTransformerEmbeddings: The cached embedding model.
+    """
+    logging.info(f"Loading embedding model: {model_name} on {device}")
+    return SentenceTransformerEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device.type},
+        encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE}
+    )
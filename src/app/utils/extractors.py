@@ -1,22 +1,85 @@
 import os
 import base64
+import hashlib
+import functools
+import threading
 import json
+import orjson
 from dotenv import load_dotenv
 from openai import OpenAI
-import re
 import logging
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+_json_decoder = json.JSONDecoder()
+# Bytes read per base64 step; a multiple of 3 so only the final block is padded
+_BASE64_BLOCK_SIZE = 57 * 1024
+
+# Shared by every extraction so worker threads reuse one connection pool
+client = OpenAI(api_key=OPENAI_API_KEY)
+
+# Extracted texts kept per extractor, keyed by file content, so re-syncing unchanged media skips the API
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "256"))
+
+def _content_digest(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(_BASE64_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _cache_by_content(func):
+    """
+    Reuses an extractor's result for files with identical content.
+    Empty results are not cached, since the extractors also return them on errors.
+    """
+    cache = {}
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(path: str):
+        try:
+            key = _content_digest(path)
+        except OSError:
+            return func(path)
+        cached = cache.get(key)
+        if cached is not None:
+            logging.info(f"Reusing extracted text for {path}")
+            return cached
+        result = func(path)
+        if result and EXTRACTION_CACHE_SIZE > 0:
+            with lock:
+                if len(cache) >= EXTRACTION_CACHE_SIZE:
+                    cache.pop(next(iter(cache)))
+                cache[key] = result
+        return result
+    return wrapper
+
 def encode_image(image_path: str):
     try:
+        # Encoded block by block so the raw file and its full encoding are never held together
         with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+            return "".join(
+                base64.b64encode(block).decode("ascii")
+                for block in iter(lambda: image_file.read(_BASE64_BLOCK_SIZE), b"")
+            )
     except Exception as e:
         logging.error(f"Error encoding image: {e}")
         return None
 
+def _first_json_object(content: str):
+    """
+    Parses the first complete JSON object in `content`, ignoring any text around it
+    (e.g. a ```json fence). The decoder stops at the object's closing brace, so braces
+    inside strings or later in the reply do not affect the match.
+    """
+    start = content.find("{")
+    if start == -1:
+        return orjson.loads(content)
+    return _json_decoder.raw_decode(content, start)[0]
+
+@_cache_by_content
 def image_to_text(image_path: str):
     """
     Extracts all text and a detailed description from the image using OpenAI Vision API.
@@ -29,7 +92,6 @@ def image_to_text(image_path: str):
             return ""
         file_extension = os.path.splitext(image_path)[1][1:]
         image_type = file_extension if file_extension else "png"
-        client = OpenAI(api_key=OPENAI_API_KEY)
         response = client.chat.completions.create(
             model="gpt-4o",
             messages=[
@@ -52,15 +114,8 @@ def image_to_text(image_path: str):
             max_tokens=1024,
         )
         content = response.choices[0].message.content
-        # Try to extract JSON block if present
-        match = re.search(r"\{.*\}", content, re.DOTALL)
-        if match:
-            json_str = match.group(0)
-        else:
-            json_str = content  # fallback
-
         try:
-            image_json = json.loads(json_str)
+            image_json = _first_json_object(content)
         except Exception as e:
             logging.error(f"Could not parse JSON: {e}\nContent was:\n{content}")
             return ""
@@ -73,6 +128,7 @@ def image_to_text(image_path: str):
         logging.error(f"Error extracting text from image: {e}")
         return ""
 
+@_cache_by_content
 def audio_to_text(audio_path: str):
     """
     Extracts text from audio using OpenAI Whisper API.
@@ -80,7 +136,6 @@ def audio_to_text(audio_path: str):
         str: Transcribed audio text.
     """
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
         with open(audio_path, "rb") as audio_file:
             translation = client.audio.translations.create(
                 model="whisper-1",
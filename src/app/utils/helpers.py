@@ -1,5 +1,8 @@
 import io
 import os
+import re
+import codecs
+import functools
 import tiktoken
 from datetime import datetime
 import tempfile
@@ -8,6 +11,24 @@ from googleapiclient.http import MediaIoBaseDownload
 
 from src.app.utils.extractors import image_to_text, audio_to_text
 
+# Start of the whitespace run before the last word of a buffer; the lookbehind
+# skips positions inside a run so long whitespace runs are not rescanned
+_LAST_WORD_BOUNDARY = re.compile(r"(?<!\s)\s+\S+\s*$")
+# Characters chunk_text_stream may hold without a word boundary (minified JSON,
+# base64) before it tokenizes them anyway, so memory stays bounded
+_STREAM_FLUSH_CHARS = 64 * 1024
+# Flattens line breaks and tabs to spaces in a single C-level pass
+_NL_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+# Characters read per step when streaming a local text file into the chunker
+_LOCAL_READ_SIZE = 64 * 1024
+# Bytes fetched per Drive range request. The library default is 100 MB, which is also
+# how much iter_drive_text would buffer per step; 8 MB keeps both requests and memory small.
+_DRIVE_CHUNK_SIZE = 8 * 1024 * 1024
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(encoding_name):
+    # Loaded on first use (it may download the BPE file) and then reused without tiktoken's registry lock
+    return tiktoken.get_encoding(encoding_name)
 
 def chunk_text(text, max_tokens=200, overlap=20, encoding_name="cl100k_base"):
     """
@@ -22,19 +43,177 @@ def chunk_text(text, max_tokens=200, overlap=20, encoding_name="cl100k_base"):
     Returns:
         list: List of text chunks.
     """
-    enc = tiktoken.get_encoding(encoding_name)
+    enc = _get_encoding(encoding_name)
     tokens = enc.encode(text)
+    # Slice every window up front and decode them in one batch call
+    windows = [tokens[start:start + max_tokens] for start in range(0, len(tokens), max_tokens - overlap)]
+    return enc.decode_batch(windows)
+
+def chunk_text_stream(pieces, max_tokens=200, overlap=20, encoding_name="cl100k_base"):
+    """
+    Splits a stream of text pieces into overlapping token chunks.
+
+    Tokenizes piece by piece and drops tokens once every window covering
+    them has been emitted, so chunking can start before the whole text is
+    available. Decoded chunks are still collected and returned as a list.
+
+    The chunks equal chunk_text on the joined text as long as the pieces
+    hold no line breaks (callers translate them with _NL_TABLE first) and
+    every _STREAM_FLUSH_CHARS characters contain some whitespace; a longer
+    run is tokenized where the limit is hit.
+
+    Args:
+        pieces (iterable): Iterable of text pieces, in order.
+        max_tokens (int): Maximum number of tokens per chunk.
+        overlap (int): Number of overlapping tokens between chunks.
+        encoding_name (str): Encoding name for tiktoken.
+
+    Returns:
+        list: List of text chunks.
+    """
+    enc = _get_encoding(encoding_name)
+    step = max_tokens - overlap
     chunks = []
-    start = 0
-    while start < len(tokens):
-        end = start + max_tokens
-        chunk_tokens = tokens[start:end]
-        chunk_text_part = enc.decode(chunk_tokens)
-        chunks.append(chunk_text_part)
-        start = end - overlap
+    tokens = []
+    # Text not tokenized yet; it never holds more than one word boundary, at its start
+    parts = []
+    size = 0
+    has_word = False
+    for piece in pieces:
+        if not piece:
+            continue
+        after_space = bool(parts) and parts[-1][-1].isspace()
+        had_word = has_word
+        has_word = has_word or not piece.isspace()
+        parts.append(piece)
+        size += len(piece)
+        # Only tokenize up to the last word boundary so no word or whitespace run is split
+        # across pieces; the boundary is searched for in the new piece alone
+        boundary = _LAST_WORD_BOUNDARY.search(piece)
+        cut = 0
+        if boundary and boundary.start() > 0:
+            cut = size - len(piece) + boundary.start()
+        elif had_word and (boundary or (after_space and not piece[0].isspace())):
+            # The last word starts this piece; its whitespace run may begin in the held text
+            cut = size - len(piece)
+        if cut:
+            pending = "".join(parts)
+            while pending[cut - 1].isspace():
+                cut -= 1
+            tokens.extend(enc.encode(pending[:cut]))
+            parts = [pending[cut:]]
+            size = len(parts[0])
+        elif size > _STREAM_FLUSH_CHARS:
+            tokens.extend(enc.encode("".join(parts)))
+            parts = []
+            size = 0
+            has_word = False
+        else:
+            continue
+        # Emit every full window the buffer now holds, then drop the consumed prefix once
+        starts = range(0, len(tokens) - max_tokens, step)
+        if starts:
+            chunks.extend(enc.decode_batch([tokens[start:start + max_tokens] for start in starts]))
+            del tokens[:starts[-1] + step]
+    tokens.extend(enc.encode("".join(parts)))
+    chunks.extend(enc.decode_batch(
+        [tokens[start:start + max_tokens] for start in range(0, len(tokens), step)]
+    ))
     return chunks
 
-def load_content_drive_file(drive_service, folder_id, file_name, logger):
+def _log_download_progress(logger, file_name, status, last_percent):
+    # Logs only when the whole-number percentage moves; returns the percentage logged last
+    percent = int(status.progress() * 100)
+    if percent != last_percent:
+        logger.info("Download progress for '%s': %d%%", file_name, percent)
+    return percent
+
+def iter_drive_text(drive_service, file_id, file_name, logger):
+    """
+    Downloads a Drive file and yields its UTF-8 text piece by piece.
+
+    Each downloaded chunk is decoded incrementally and the download buffer
+    is reset, so memory stays bounded by the download chunk size.
+    """
+    request = drive_service.files().get_media(fileId=file_id)
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=_DRIVE_CHUNK_SIZE)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    done = False
+    last_percent = -1
+    while not done:
+        status, done = downloader.next_chunk()
+        last_percent = _log_download_progress(logger, file_name, status, last_percent)
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        yield decoder.decode(data, final=done)
+
+def download_drive_file(drive_service, file_id, fd, file_name, logger):
+    """
+    Downloads a Drive file straight into the writable file object `fd`.
+    """
+    request = drive_service.files().get_media(fileId=file_id)
+    downloader = MediaIoBaseDownload(fd, request, chunksize=_DRIVE_CHUNK_SIZE)
+
+    done = False
+    last_percent = -1
+    while not done:
+        status, done = downloader.next_chunk()
+        last_percent = _log_download_progress(logger, file_name, status, last_percent)
+
+def list_drive_folder(drive_service, folder_id):
+    """
+    Lists the files in a Drive folder in as few requests as possible.
+
+    Args:
+        drive_service: Google Drive API service instance.
+        folder_id (str): ID of the folder to list.
+
+    Returns:
+        dict: File metadata (id, name, mimeType, modifiedTime) keyed by file name.
+    """
+    folder_files = {}
+    page_token = None
+    while True:
+        results = drive_service.files().list(
+            q=f"'{folder_id}' in parents and trashed = false",
+            spaces='drive',
+            fields='nextPageToken, files(id, name, mimeType, modifiedTime)',
+            pageSize=1000,
+            pageToken=page_token
+        ).execute()
+        for file in results.get('files', []):
+            folder_files.setdefault(file['name'], file)
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return folder_files
+
+# Media types the loaders can extract text from: mime type -> (download suffix, extractor, file_type)
+_MEDIA_HANDLERS = {
+    "image/jpeg": (".jpg", image_to_text, "image"),
+    "image/png": (".png", image_to_text, "image"),
+    "audio/x-wav": (".wav", audio_to_text, "audio"),
+    "audio/mpeg": (".mp3", audio_to_text, "audio"),
+}
+# Local files whose guessed mime type is missing or unsupported fall back to their extension
+_EXTENSION_MIME_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/plain",
+    ".csv": "text/plain",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".wav": "audio/x-wav",
+    ".mp3": "audio/mpeg",
+}
+
+def _extract_media_chunks(extractor, path):
+    page_content = extractor(path)
+    return chunk_text(page_content.translate(_NL_TABLE), max_tokens=200, overlap=20)
+
+def load_content_drive_file(drive_service, folder_id, file_name, logger, file_info=None):
     """
     Download a file from Google Drive by name and folder_id.
     Returns (page_content, modified_time) if found, else (None, None).
@@ -44,80 +223,58 @@ def load_content_drive_file(drive_service, folder_id, file_name, logger):
         folder_id (str): ID of the folder to search in.
         file_name (str): Name of the file to download.
         logger: Logger instance for logging.
+        file_info (dict): Metadata from list_drive_folder; skips the per-file lookup when given.
 
     Returns:
         tuple: (page_content, modified_time) or (None, None) on failure.
     """
 
     try:
-        query = f"'{folder_id}' in parents and name = '{file_name}' and trashed = false"
-        results = drive_service.files().list(
-            q=query,
-            spaces='drive',
-            fields='files(id, name, mimeType, modifiedTime)',
-            pageSize=1
-        ).execute()
-        files = results.get('files', [])
+        if file_info is None:
+            query = f"'{folder_id}' in parents and name = '{file_name}' and trashed = false"
+            results = drive_service.files().list(
+                q=query,
+                spaces='drive',
+                fields='files(id, name, mimeType, modifiedTime)',
+                pageSize=1
+            ).execute()
+            files = results.get('files', [])
 
-        if not files:
-            logger.warning("File not found: %s", file_name)
-            return None, None
+            if not files:
+                logger.warning("File not found: %s", file_name)
+                return None, None
+            file_info = files[0]
 
-        file_id = files[0]['id']
-        file_mime_type = files[0].get('mimeType', '')
-        modified_time = files[0].get('modifiedTime', str(datetime.utcnow()))
+        file_id = file_info['id']
+        file_mime_type = file_info.get('mimeType', '')
+        modified_time = file_info.get('modifiedTime', str(datetime.utcnow()))
         logger.info("Downloading file '%s' (ID: %s)", file_name, file_id)
 
-        request = drive_service.files().get_media(fileId=file_id)
-        file_content = io.BytesIO()
-        downloader = MediaIoBaseDownload(file_content, request)
-
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-            logger.info("Download progress for '%s': %d%%", file_name, int(status.progress() * 100))
-
-        file_content.seek(0)
-
         if file_mime_type == "text/plain":
-            page_content = file_content.read().decode('utf-8')
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks":content_chunks,
-                "modified_time":modified_time,
-                "file_type":"text"
-                }
-
-        elif file_mime_type in ["image/jpeg", "image/png"]:
-            suffix = ".jpg" if file_mime_type == "image/jpeg" else ".png"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_img:
-                tmp_img.write(file_content.read())
-                tmp_img_path = tmp_img.name
-            page_content = image_to_text(tmp_img_path)
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks":content_chunks,
-                "modified_time":modified_time,
-                "file_type":"image"
-                }
-
-        elif file_mime_type in ["audio/x-wav", "audio/mpeg"]:
-            suffix = ".wav" if file_mime_type == "audio/x-wav" else ".mp3"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_audio:
-                tmp_audio.write(file_content.read())
-                tmp_audio_path = tmp_audio.name
-            page_content = audio_to_text(tmp_audio_path)
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks":content_chunks,
-                "modified_time":modified_time,
-                "file_type":"audio"
-                }
-
+            content_chunks = chunk_text_stream(
+                (piece.translate(_NL_TABLE) for piece in iter_drive_text(drive_service, file_id, file_name, logger)),
+                max_tokens=200,
+                overlap=20
+            )
+            file_type = "text"
+        elif file_mime_type in _MEDIA_HANDLERS:
+            suffix, extractor, file_type = _MEDIA_HANDLERS[file_mime_type]
+            # The directory and the download inside it are removed once the text is extracted
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_path = os.path.join(tmp_dir, f"download{suffix}")
+                with open(tmp_path, "wb") as tmp_file:
+                    download_drive_file(drive_service, file_id, tmp_file, file_name, logger)
+                content_chunks = _extract_media_chunks(extractor, tmp_path)
         else:
             logger.warning("Unsupported mimeType: %s", file_mime_type)
             return None, None
 
+        return {
+            "content_chunks":content_chunks,
+            "modified_time":modified_time,
+            "file_type":file_type
+            }
+
     except Exception as e:
         logger.error(f"Error downloading file {file_name}: {e}")
         return None, None
@@ -130,53 +287,33 @@ def load_content_local_file(file_path, logger):
     try:
         file_mime_type, _ = mimetypes.guess_type(file_path)
         modified_time = str(datetime.utcfromtimestamp(os.path.getmtime(file_path)))
-
-        # Open as binary for all file types
-        with open(file_path, 'rb') as file:
-            file_content = file.read()
+        mime_type = file_mime_type
+        if mime_type != "text/plain" and mime_type not in _MEDIA_HANDLERS:
+            mime_type = _EXTENSION_MIME_TYPES.get(os.path.splitext(file_path)[1])
 
         # Text files
-        if file_mime_type == "text/plain" or file_path.endswith(('.txt', '.md', '.csv')):
-            page_content = file_content.decode('utf-8')  # Now this works because file_content is bytes
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks": content_chunks,
-                "modified_time": modified_time,
-                "file_type": "text"
-            }
-
-        # Image files
-        elif file_mime_type in ["image/jpeg", "image/png"] or file_path.endswith(('.jpg', '.jpeg', '.png')):
-            suffix = ".jpg" if file_path.endswith(('.jpg', '.jpeg')) else ".png"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_img:
-                tmp_img.write(file_content)
-                tmp_img_path = tmp_img.name
-            page_content = image_to_text(tmp_img_path)
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks": content_chunks,
-                "modified_time": modified_time,
-                "file_type": "image"
-            }
-
-        # Audio files
-        elif file_mime_type in ["audio/x-wav", "audio/mpeg"] or file_path.endswith(('.wav', '.mp3')):
-            suffix = ".wav" if file_path.endswith('.wav') else ".mp3"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_audio:
-                tmp_audio.write(file_content)
-                tmp_audio_path = tmp_audio.name
-            page_content = audio_to_text(tmp_audio_path)
-            content_chunks = chunk_text(page_content.replace('\n', ' '), max_tokens=200, overlap=20)
-            return {
-                "content_chunks": content_chunks,
-                "modified_time": modified_time,
-                "file_type": "audio"
-            }
-
+        if mime_type == "text/plain":
+            with open(file_path, 'r', encoding='utf-8') as file:
+                content_chunks = chunk_text_stream(
+                    (piece.translate(_NL_TABLE) for piece in iter(lambda: file.read(_LOCAL_READ_SIZE), "")),
+                    max_tokens=200,
+                    overlap=20
+                )
+            file_type = "text"
+        # Images and audio are already on disk, so the extractor reads them in place
+        elif mime_type in _MEDIA_HANDLERS:
+            _, extractor, file_type = _MEDIA_HANDLERS[mime_type]
+            content_chunks = _extract_media_chunks(extractor, file_path)
         else:
             logger.warning("Unsupported file type: %s", file_mime_type)
             return None
 
+        return {
+            "content_chunks": content_chunks,
+            "modified_time": modified_time,
+            "file_type": file_type
+        }
+
     except Exception as e:
         logger.error(f"Error loading local file {file_path}: {e}")
         return None
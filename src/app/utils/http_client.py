@@ -0,0 +1,24 @@
+import importlib.util
+
+import httpx
+
+# One pooled client for every Trello, Graph and backend call so connections are kept alive between requests
+_http_client = None
+# Concurrent requests are multiplexed over one HTTP/2 connection when h2 is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=30
+        )
+    return _http_client
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
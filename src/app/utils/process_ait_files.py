@@ -29,6 +29,10 @@ DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS") 
 DB_NAME = os.getenv("DB_NAME") 
 
+# Bytes copied per step when saving uploads to the temp folder
+_UPLOAD_COPY_BUFSIZE = 1024 * 1024
+
+# The pool is opened once at application startup and shared by concurrent requests
 db = AsyncMySQLDatabase(
     host=DB_HOST,
     port=DB_PORT,
@@ -37,6 +41,17 @@ db = AsyncMySQLDatabase(
     database=DB_NAME
 )
 
+def _save_upload(upload, file_path):
+    """
+    Copies an uploaded file to `file_path` in fixed-size blocks.
+
+    The upload is already spooled by Starlette, so it is streamed from its
+    file object instead of being read into memory as a single bytes object.
+    """
+    upload.file.seek(0)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(upload.file, f, _UPLOAD_COPY_BUFSIZE)
+
 async def insert_custom_gpt_files(custom_gpt_id: str, file_names: List[str], file_type: str = "bib") -> bool:
     """
     Insert multiple file records into custom_gpt_files table
@@ -122,6 +137,7 @@ async def create_ait_main(user_id,
     file_names_list = []
  # Example usage to drop all collections
     try:
+        # Opened once at application startup; only connects here if that failed
         await db.create_pool()
     except Exception as e:
         return {"status": False, "code": 500, "message": f"Database connection failed: {str(e)}"}
@@ -137,9 +153,7 @@ async def create_ait_main(user_id,
             for upload in files:
                 if upload.filename:
                     file_path = os.path.join(save_dir, upload.filename)
-                    file_content = await upload.read()
-                    with open(file_path, "wb") as f:
-                        f.write(file_content)
+                    await asyncio.to_thread(_save_upload, upload, file_path)
                     local_file_paths.append(upload.filename)
             file_names_list = local_file_paths
 
@@ -232,8 +246,6 @@ async def create_ait_main(user_id,
         await delete_custom_gpt_files_by_gpt_id(ait_id)
         await db.delete("custom_gpts", "id = %s", (ait_id,))
         return {"status": False, "code": 500, "message": f"Internal server error: {str(e)}"}
-    finally:
-        await db.close_pool()
 
 
 async def create_embeddings_main(files,
@@ -243,6 +255,7 @@ async def create_embeddings_main(files,
     document_collection,
     ait_id):
     try:
+        # Opened once at application startup; only connects here if that failed
         await db.create_pool()
     except Exception as e:
         return {"status": False, "code": 500, "message": f"Database connection failed: {str(e)}"}
@@ -260,9 +273,7 @@ async def create_embeddings_main(files,
             for upload in files:
                 if upload.filename:  # Check if file actually exists
                     file_path = os.path.join(save_dir, upload.filename)
-                    file_content = await upload.read()
-                    with open(file_path, "wb") as f:
-                        f.write(file_content)
+                    await asyncio.to_thread(_save_upload, upload, file_path)
                     local_file_paths.append(upload.filename)
             
             file_names_list = local_file_paths
@@ -304,6 +315,4 @@ async def create_embeddings_main(files,
         logging.error(f"Unexpected error in build_index_route: {str(e)}")
         await delete_custom_gpt_files_by_gpt_id(ait_id)
         return {"status": False, "code": 500, "message": f"Internal server error: {str(e)}"}
-    finally:
-        await db.close_pool()
 
@@ -1,18 +1,148 @@
-import json
+import os
+import time
+import copy
+import inspect
+import functools
 import re
+import orjson
 import httpx
 import asyncio
 import logging
 
 from src.database.sql import AsyncMySQLDatabase
+from src.app.utils.http_client import get_http_client
 
+# Shared by the Trello modules; the pool is opened once at application startup
 db = AsyncMySQLDatabase()
 
+TRELLO_API_BASE = "https://trello.com/1"
+
+# Caps in-flight Trello requests so fanning out over many boards does not trip the API rate limit
+TRELLO_CONCURRENCY = int(os.getenv("TRELLO_CONCURRENCY", "8"))
+TRELLO_MAX_RETRIES = int(os.getenv("TRELLO_MAX_RETRIES", "3"))
+_trello_semaphore = asyncio.Semaphore(TRELLO_CONCURRENCY)
+
+async def trello_get(url, **kwargs) -> httpx.Response:
+    """
+    GET a Trello URL through the shared client, bounded by TRELLO_CONCURRENCY.
+
+    HTTP 429 responses are retried with exponential backoff, honouring the
+    Retry-After header when Trello sends one.
+
+    Args:
+        url (str): Request URL.
+        **kwargs: Extra arguments passed to httpx.AsyncClient.get.
+
+    Returns:
+        httpx.Response: The successful response.
+    """
+    client = get_http_client()
+    delay = 1.0
+    for attempt in range(TRELLO_MAX_RETRIES + 1):
+        async with _trello_semaphore:
+            response = await client.get(url, **kwargs)
+        logging.debug(f"Trello GET {response.url.path} over {response.http_version}")
+        if response.status_code != 429 or attempt == TRELLO_MAX_RETRIES:
+            break
+        delay = await _wait_for_rate_limit(response, delay)
+    response.raise_for_status()
+    return response
+
+async def trello_stream_items(url, **kwargs):
+    """
+    GET a Trello URL that returns a JSON array and yield its elements as they are parsed,
+    so callers can start work before the whole body has arrived.
+
+    Uses the same concurrency cap and 429 handling as trello_get. Requires ijson.
+
+    Args:
+        url (str): Request URL.
+        **kwargs: Extra arguments passed to httpx.AsyncClient.stream.
+
+    Yields:
+        dict: Each element of the top-level array.
+    """
+    import ijson
+
+    client = get_http_client()
+    delay = 1.0
+    for attempt in range(TRELLO_MAX_RETRIES + 1):
+        async with _trello_semaphore:
+            async with client.stream("GET", url, **kwargs) as response:
+                if response.status_code != 429 or attempt == TRELLO_MAX_RETRIES:
+                    response.raise_for_status()
+                    items = ijson.sendable_list()
+                    parser = ijson.items_coro(items, "item", use_float=True)
+                    async for chunk in response.aiter_bytes():
+                        parser.send(chunk)
+                        for item in items:
+                            yield item
+                        del items[:]
+                    parser.close()
+                    for item in items:
+                        yield item
+                    return
+        delay = await _wait_for_rate_limit(response, delay)
+
+# Trello's /batch endpoint accepts at most this many routes per request
+TRELLO_BATCH_LIMIT = 10
+
+async def trello_batch(routes, api_key, token):
+    """
+    Fetches Trello GET routes through /1/batch, up to TRELLO_BATCH_LIMIT routes per request.
+
+    Routes must not carry their own query string (the batch `urls` parameter is
+    comma separated), e.g. "/boards/{id}/members".
+
+    Args:
+        routes (list): API routes without the version prefix.
+        api_key (str): Trello API key.
+        token (str): Trello user token.
+
+    Returns:
+        list: One parsed body per route, in order, or None where that route failed.
+    """
+    chunks = [routes[i:i + TRELLO_BATCH_LIMIT] for i in range(0, len(routes), TRELLO_BATCH_LIMIT)]
+    responses = await asyncio.gather(
+        *[
+            trello_get(f"{TRELLO_API_BASE}/batch", params={"urls": ",".join(chunk), "key": api_key, "token": token})
+            for chunk in chunks
+        ],
+        return_exceptions=True
+    )
+    results = []
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, Exception):
+            logging.error(f"Trello batch request failed for {len(chunk)} routes: {response}")
+            results.extend([None] * len(chunk))
+            continue
+        # Each entry is keyed by its own status code, e.g. {"200": body}
+        results.extend(item.get("200") for item in orjson.loads(response.content))
+    return results
+
+async def _wait_for_rate_limit(response, delay):
+    # Sleeps for Retry-After when Trello sends it, otherwise for `delay`; returns the next backoff delay
+    retry_after = response.headers.get("Retry-After")
+    wait = float(retry_after) if retry_after and retry_after.isdigit() else delay
+    logging.warning(f"Trello rate limit hit, retrying in {wait}s")
+    await asyncio.sleep(wait)
+    return delay * 2
+
+# Both values are constant for the process lifetime, so they are fetched once and reused
+_trello_service_id = None
+_trello_api_key = None
+
 async def get_trello_service_id():
-    await db.create_pool()
-    service_id = await db.select_one(table ="master_service", columns = "id", where= "service_name = 'Trello'")
-    await db.close_pool()
-    return service_id.get("id")
+    global _trello_service_id
+    if _trello_service_id is None:
+        service_id = await db.select_one(
+            table="master_service",
+            columns="id",
+            where="service_name = %s",
+            params=("Trello",)
+        )
+        _trello_service_id = service_id.get("id")
+    return _trello_service_id
 
 async def get_trello_token(ait_it: str) -> dict | None:
     """
@@ -24,8 +154,6 @@ async def get_trello_token(ait_it: str) -> dict | None:
         return None
 
     try:
-        await db.create_pool()
-
         trello_token = await db.select_one(
             table="user_services",
             columns="auth_secret",
@@ -34,74 +162,123 @@ async def get_trello_token(ait_it: str) -> dict | None:
         )
 
         if trello_token:
-            return json.loads(trello_token.get("auth_secret"))
+            return orjson.loads(trello_token.get("auth_secret"))
         return None
 
     except Exception as e:
         return None
 
-    finally:
-        await db.close_pool()
-
 async def get_trello_api_key():
-    await db.create_pool()
+    global _trello_api_key
+    if _trello_api_key is not None:
+        return _trello_api_key
     service_name = "Trello"
     key = "api_key"
 
     trello_api_key = await db.select_one(
         table="master_settings",
         columns="value",
-        where=f"service = '{service_name}' AND `key` = '{key}'"
+        where="service = %s AND `key` = %s",
+        params=(service_name, key)
     )
-    await db.close_pool()
-    return trello_api_key.get("value")
+    _trello_api_key = trello_api_key.get("value")
+    return _trello_api_key
+
+# Boards, the user and board members change rarely, so lookups are reused across queries
+TRELLO_CACHE_TTL = int(os.getenv("TRELLO_CACHE_TTL", "300"))
+_TRELLO_CACHE_MAXSIZE = 256
 
+def _trello_ttl_cache(func):
+    """
+    Caches a Trello lookup's results per arguments for TRELLO_CACHE_TTL seconds.
+    Empty results are not cached, since the lookups also return them on errors.
+
+    Callers get their own copy, so mutating it never touches the cache. Passing
+    use_cache=False always fetches fresh data (and refreshes the entry); syncs
+    use it so they never index a stale board list or member set.
+    """
+    cache = {}
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, use_cache=True, **kwargs):
+        # Bind first so positional and keyword callers share entries; board_ids lists are not hashable
+        bound = signature.bind(*args, **kwargs)
+        key = tuple(tuple(v) if isinstance(v, list) else v for v in bound.arguments.values())
+        cached = cache.get(key)
+        if use_cache and cached and time.monotonic() - cached[0] < TRELLO_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        result = await func(*args, **kwargs)
+        if result:
+            cache.pop(key, None)
+            if len(cache) >= _TRELLO_CACHE_MAXSIZE:
+                cache.pop(next(iter(cache)))
+            cache[key] = (time.monotonic(), copy.deepcopy(result))
+        return result
+
+    return wrapper
+
+@_trello_ttl_cache
 async def get_trello_user_board(api_key, token):
     board_ids = []
-    url = f"https://trello.com/1/members/me/boards?key={api_key}&token={token}"
+    url = f"{TRELLO_API_BASE}/members/me/boards"
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            boards = response.json()
-            # boards is likely a list of board objects
-            for board in boards:
-                board_id = board.get("id")
-                if board_id:
-                    board_ids.append(board_id)
+        # Only the board ids are used
+        response = await trello_get(url, params={"key": api_key, "token": token, "fields": "id"})
+        boards = orjson.loads(response.content)
+        # boards is likely a list of board objects
+        for board in boards:
+            board_id = board.get("id")
+            if board_id:
+                board_ids.append(board_id)
     except Exception as e:
         logging.error(f"Error fetching Trello user boards: {e}")
     return board_ids
 
+@_trello_ttl_cache
 async def get_trello_user(api_key, token):
-    url = f"https://trello.com/1/members/me?key={api_key}&token={token}"
+    url = f"{TRELLO_API_BASE}/members/me"
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            trello_user = response.json()
-            return trello_user
+        # The full member object carries prefs and id lists that build_user_text never reads
+        response = await trello_get(
+            url,
+            params={"key": api_key, "token": token, "fields": "fullName,username,email,bio,url"}
+        )
+        trello_user = orjson.loads(response.content)
+        return trello_user
     except Exception as e:
         logging.error(f"Error fetching Trello user: {e}")
         return None
 
+@_trello_ttl_cache
 async def get_trello_members(board_ids, api_key, token):
     trello_members = []
     try:
-        for board_id in board_ids:
-            url = f"https://trello.com/1/boards/{board_id}/members?key={api_key}&token={token}"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                trello_members.append(response.json())
+        # One batch request covers up to ten boards instead of one request per board
+        routes = [f"/boards/{board_id}/members" for board_id in board_ids]
+        members_per_board = await trello_batch(routes, api_key, token)
+        for board_id, members in zip(board_ids, members_per_board):
+            if members is None:
+                logging.error(f"Error fetching Trello members for board {board_id}")
+                continue
+            trello_members.append(members)
     except Exception as e:
         logging.error(f"Error fetching Trello board members: {e}")
     return trello_members
 
+# filepath -> (mtime, stripped contents); the file only changes on redeploy
+_metadata_cache = {}
+
 def read_metadata(filepath):
     try:
+        mtime = os.path.getmtime(filepath)
+        cached = _metadata_cache.get(filepath)
+        if cached and cached[0] == mtime:
+            return cached[1]
         with open(filepath, "r") as file:
-            return file.read().strip()
+            metadata = file.read().strip()
+        _metadata_cache[filepath] = (mtime, metadata)
+        return metadata
     except Exception as e:
         logging.error(f"Error reading metadata file: {e}")
         return ""
@@ -334,7 +511,7 @@ Given the following user query and Trello log metadata keys, extract the relevan
 def extract_json_from_response(content):
     try:
         # Try to parse the whole content first
-        return json.loads(content)
+        return orjson.loads(content)
     except Exception:
         pass  # fallback to regex below
 
@@ -343,14 +520,14 @@ def extract_json_from_response(content):
         array_match = re.search(r'\[\s*{[\s\S]*}\s*\]', content)
         if array_match:
             json_str = array_match.group(0)
-            return json.loads(json_str)
+            return orjson.loads(json_str)
         # Otherwise, try to find all JSON objects and parse as a list
         objects = re.findall(r'\{[\s\S]*?\}', content)
         if len(objects) > 1:
             json_str = "[" + ",".join(objects) + "]"
-            return json.loads(json_str)
+            return orjson.loads(json_str)
         elif len(objects) == 1:
-            return json.loads(objects[0])
+            return orjson.loads(objects[0])
         else:
             logging.warning("No JSON object found in response content.")
             return None
@@ -423,13 +600,26 @@ def flatten_dict(d, parent_key='', sep='.'):
             items.append((new_key, v))
     return dict(items)
 
+def _append_flat_parts(d, parts, parent_key=''):
+    # Same traversal as flatten_dict, but writes "key: value" strings straight into
+    # one list instead of building and merging an intermediate dict per nesting level
+    for k, v in d.items():
+        new_key = f"{parent_key}.{k}" if parent_key else k
+        if isinstance(v, dict):
+            _append_flat_parts(v, parts, new_key)
+        elif isinstance(v, list) and v and isinstance(v[0], dict):
+            for idx, item in enumerate(v):
+                _append_flat_parts(item, parts, f"{new_key}[{idx}]")
+        else:
+            parts.append(f"{new_key}: {v}")
+    return parts
+
 def build_log_text(log: dict) -> str:
     """
     Build a rich, human-readable string from a Trello log entry,
     including all nested keys and values.
     """
-    flat = flatten_dict(log)
-    return " | ".join([f"{k}: {v}" for k, v in flat.items()])
+    return " | ".join(_append_flat_parts(log, []))
 
 def build_user_text(user_data: dict) -> str:
     """
@@ -456,21 +646,22 @@ def build_card_text(card_data: dict) -> str:
     Build a concise, human-readable string from a Trello card entry,
     including only essential fields for semantic search.
     """
-    parts = []
-    parts.append(f"Card Name: {card_data.get('name', '')}")
-    parts.append(f"Card ID: {card_data.get('id', '')}")
-    parts.append(f"Board ID: {card_data.get('idBoard', '')}")
-    parts.append(f"List ID: {card_data.get('idList', '')}")
-    parts.append(f"Description: {card_data.get('desc', '')}")
-    parts.append(f"Members: {', '.join(card_data.get('idMembers', []))}")
-    parts.append(f"Labels: {', '.join(card_data.get('idLabels', []))}")
-    parts.append(f"Checklist IDs: {', '.join(card_data.get('idChecklists', []))}")
-    parts.append(f"Attachment Cover ID: {card_data.get('idAttachmentCover', '')}")
-    parts.append(f"Due: {card_data.get('due', '')}")
-    parts.append(f"Due Complete: {card_data.get('dueComplete', False)}")
-    parts.append(f"Date Last Activity: {card_data.get('dateLastActivity', '')}")
-    parts.append(f"Short URL: {card_data.get('shortUrl', '')}")
-    return " | ".join(parts)
+    get = card_data.get
+    return (
+        f"Card Name: {get('name', '')} | "
+        f"Card ID: {get('id', '')} | "
+        f"Board ID: {get('idBoard', '')} | "
+        f"List ID: {get('idList', '')} | "
+        f"Description: {get('desc', '')} | "
+        f"Members: {', '.join(get('idMembers', []))} | "
+        f"Labels: {', '.join(get('idLabels', []))} | "
+        f"Checklist IDs: {', '.join(get('idChecklists', []))} | "
+        f"Attachment Cover ID: {get('idAttachmentCover', '')} | "
+        f"Due: {get('due', '')} | "
+        f"Due Complete: {get('dueComplete', False)} | "
+        f"Date Last Activity: {get('dateLastActivity', '')} | "
+        f"Short URL: {get('shortUrl', '')}"
+    )
 
 def build_member_text(member_data: dict) -> str:
     """
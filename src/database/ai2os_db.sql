@@ -93,13 +93,14 @@ CREATE TABLE `master_settings` (
 
 CREATE TABLE `user_services` (
   `id` bigint UNSIGNED NOT NULL AUTO_INCREMENT,
-  `ait_id` bigint UNSIGNED NOT NULL,
+  `custom_gpt_id` bigint UNSIGNED NOT NULL,
   `service_id` bigint UNSIGNED NOT NULL,
   `auth_secret` varchar(255) COLLATE utf8mb4_unicode_ci NOT NULL,
   `created_at` timestamp NULL DEFAULT NULL,
   `updated_at` timestamp NULL DEFAULT NULL,
   `deleted_at` timestamp NULL DEFAULT NULL,
-  PRIMARY KEY (`id`)
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `user_services_custom_gpt_id_service_id_unique` (`custom_gpt_id`, `service_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 COMMIT;
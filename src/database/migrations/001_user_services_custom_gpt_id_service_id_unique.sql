@@ -0,0 +1,28 @@
+-- --------------------------------------------------------
+-- Migration: one user_services row per (custom_gpt_id, service_id)
+--
+-- save_token in trello_auth and mse_token_store writes tokens with
+-- INSERT ... ON DUPLICATE KEY UPDATE, which only updates in place when
+-- this unique key exists. Run once against every existing database.
+-- --------------------------------------------------------
+
+START TRANSACTION;
+
+-- Keep a single row per pair: prefer the active (not soft-deleted) row,
+-- then the most recently updated one, then the newest id
+DELETE us
+FROM user_services us
+JOIN (
+  SELECT `id`,
+         ROW_NUMBER() OVER (
+           PARTITION BY `custom_gpt_id`, `service_id`
+           ORDER BY `deleted_at` IS NULL DESC, `updated_at` DESC, `id` DESC
+         ) AS row_rank
+  FROM user_services
+) ranked ON ranked.`id` = us.`id`
+WHERE ranked.row_rank > 1;
+
+COMMIT;
+
+ALTER TABLE `user_services`
+  ADD UNIQUE KEY `user_services_custom_gpt_id_service_id_unique` (`custom_gpt_id`, `service_id`);
@@ -1,6 +1,16 @@
 from qdrant_client import QdrantClient
 from qdrant_client.async_qdrant_client import AsyncQdrantClient
-from qdrant_client.models import Distance, VectorParams, Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    Distance, VectorParams, Filter, FieldCondition, MatchValue, HnswConfigDiff, SearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, QuantizationSearchParams
+)
+
+# HNSW graph parameters for the per-AIT collections
+HNSW_M = 32
+HNSW_EF_CONSTRUCT = 200
+HNSW_EF_SEARCH = 64
+# Below this many vectors an exact scan is faster than walking the graph
+ANN_MIN_VECTORS = 4096
 
 class QdrantService:
     def __init__(self, host="localhost", port=6333):
@@ -16,11 +26,26 @@ class QdrantService:
             return False
 
     async def create_collection(self, collection_name):
+        vector_size = self.client.get_embedding_size("sentence-transformers/all-MiniLM-L6-v2")
         await self.client.create_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(
-                size=self.client.get_embedding_size("sentence-transformers/all-MiniLM-L6-v2"),
+                size=vector_size,
                 distance=Distance.COSINE
+            ),
+            hnsw_config=HnswConfigDiff(
+                m=HNSW_M,
+                ef_construct=HNSW_EF_CONSTRUCT,
+                # Qdrant expresses the exact-scan cutoff in KB of float32 vectors
+                full_scan_threshold=ANN_MIN_VECTORS * vector_size * 4 // 1024
+            ),
+            # INT8 copies of the vectors (4x smaller) are scanned first, originals are kept for rescoring
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
             )
         )
 
@@ -43,7 +68,11 @@ class QdrantService:
             collection_name=ait_id,
             query_vector=query_vector,
             limit=limit,
-            query_filter=exp_filter
+            query_filter=exp_filter,
+            search_params=SearchParams(
+                hnsw_ef=HNSW_EF_SEARCH,
+                quantization=QuantizationSearchParams(rescore=True)
+            )
         )
     
     async def delete_by_source_id(self, collection_name, source_id):
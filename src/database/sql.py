@@ -5,8 +5,6 @@ import aiomysql
 from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 load_dotenv(override=True)
@@ -30,13 +28,10 @@ class AsyncMySQLDatabase:
         self.database = database
         self.pool = None
 
-    async def select_one(self, table: str, columns: str = "*", where: str = None, params: tuple = None) -> Optional[Dict[str, Any]]:
-        """Select one record from table"""
-        result = await self.select(table, columns, where, params, limit=1)
-        return result[0] if result else None
-        
     async def create_pool(self, minsize: int = 1, maxsize: int = 10):
-        """Create connection pool"""
+        """Create connection pool (no-op if a pool is already open)"""
+        if self.pool is not None:
+            return
         try:
             self.pool = await aiomysql.create_pool(
                 host=self.host,
@@ -58,6 +53,7 @@ class AsyncMySQLDatabase:
         if self.pool:
             self.pool.close()
             await self.pool.wait_closed()
+            self.pool = None
             logger.info("Database connection pool closed")
     
     async def execute_query(self, query: str, params: tuple = None) -> Optional[List[Dict[str, Any]]]:
@@ -118,6 +114,16 @@ class AsyncMySQLDatabase:
         logger.info(f"Insert many into {table} status: {status}")
         return status
     
+    async def upsert(self, table: str, data: Dict[str, Any], update_cols: List[str]) -> bool:
+        """Insert a record, or overwrite update_cols on the existing row if it collides with any unique key of the table"""
+        columns = ', '.join([f"`{col}`" for col in data.keys()])
+        placeholders = ', '.join(['%s'] * len(data))
+        update_clause = ', '.join([f"`{col}` = VALUES(`{col}`)" for col in update_cols])
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {update_clause}"
+        status = await self.execute_non_query(query, tuple(data.values()))
+        logger.info(f"Upsert into {table} status: {status}")
+        return status
+    
     async def select(self, table: str, columns: str = "*", where: str = None, 
                     params: tuple = None, order_by: str = None, limit: int = None) -> Optional[List[Dict[str, Any]]]:
         """Select records from table"""
@@ -174,3 +180,15 @@ class AsyncMySQLDatabase:
         if result and result[0]['count'] > 0:
             return True
         return False
+    
+    async def unique_key_exists(self, table_name: str, columns: List[str]) -> bool:
+        """Check if table has a unique key on exactly these columns, in this order"""
+        query = """
+        SELECT index_name, GROUP_CONCAT(column_name ORDER BY seq_in_index) as key_columns
+        FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = %s AND non_unique = 0
+        GROUP BY index_name
+        """
+        result = await self.execute_query(query, (self.database, table_name))
+        expected = ','.join(columns)
+        return any(row['key_columns'] == expected for row in result or [])